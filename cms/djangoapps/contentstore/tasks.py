@@ -0,0 +1,37 @@
+"""
+Background tasks for Studio course content.
+"""
+from celery import task
+from celery.utils.log import get_task_logger
+
+from cache_toolbox.core import del_cached_content
+from xmodule.contentstore.django import contentstore
+from xmodule.exceptions import NotFoundError
+from xmodule.modulestore import Location
+
+log = get_task_logger(__name__)
+
+
+@task()  # pylint: disable=E1102
+def generate_asset_thumbnail(content_location):
+    """
+    Generates the thumbnail for the uploaded asset at `content_location` (a url string) and records
+    it on the asset.  Uploads return before this runs, so until it finishes the asset has no thumbnail.
+    """
+    store = contentstore()
+    location = Location(content_location)
+    try:
+        content = store.find(location)
+    except NotFoundError:
+        # the asset was deleted before we got to it
+        log.info(u"Asset %s no longer exists, not generating a thumbnail", content_location)
+        return
+
+    thumbnail_content, thumbnail_location = store.generate_thumbnail(content)
+
+    # delete cached thumbnail even if one couldn't be created this time (else
+    # the old thumbnail will continue to show)
+    del_cached_content(thumbnail_location)
+    if thumbnail_content is not None:
+        store.set_attr(location, 'thumbnail_location', thumbnail_location)
+        del_cached_content(location)
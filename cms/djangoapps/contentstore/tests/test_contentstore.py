@@ -1046,7 +1046,10 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         print 'Exporting to tempdir = {0}'.format(root_dir)
 
         # export out to a tempdir
-        export_to_xml(module_store, content_store, location, root_dir, 'test_export', draft_modulestore=draft_store)
+        with mock.patch.object(draft_store, 'get_parent_locations', wraps=draft_store.get_parent_locations) as mock_parents:
+            export_to_xml(module_store, content_store, location, root_dir, 'test_export', draft_modulestore=draft_store)
+        # the parents of the draft verticals come from the exported course tree
+        self.assertFalse(mock_parents.called)
 
         # check for static tabs
         self.verify_content_existence(module_store, root_dir, location, 'tabs', 'static_tab', '.html')
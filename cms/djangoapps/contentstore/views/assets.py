@@ -1,5 +1,4 @@
 import logging
-from functools import partial
 import math
 import json
 
@@ -29,6 +28,7 @@ from django.http import HttpResponseNotFound
 from django.utils.translation import ugettext as _
 from pymongo import ASCENDING, DESCENDING
 from .access import has_course_access
+from ..tasks import generate_asset_thumbnail
 
 __all__ = ['assets_handler']
 
@@ -184,38 +184,19 @@ def _upload_asset(request, location):
 
     content_loc = StaticContent.compute_location(old_location.org, old_location.course, filename)
 
-    chunked = upload_file.multiple_chunks()
-    sc_partial = partial(StaticContent, content_loc, filename, mime_type)
-    if chunked:
-        content = sc_partial(upload_file.chunks())
-        tempfile_path = upload_file.temporary_file_path()
-    else:
-        content = sc_partial(upload_file.read())
-        tempfile_path = None
-
-    # first let's see if a thumbnail can be created
-    (thumbnail_content, thumbnail_location) = contentstore().generate_thumbnail(
-            content,
-            tempfile_path=tempfile_path
-    )
-
-    # delete cached thumbnail even if one couldn't be created this time (else
-    # the old thumbnail will continue to show)
-    del_cached_content(thumbnail_location)
-    # now store thumbnail location only if we could create it
-    if thumbnail_content is not None:
-        content.thumbnail_location = thumbnail_location
-
-    # then commit the content
+    # stream the upload straight into the contentstore rather than reading it into memory first;
+    # saving records the database timestamp on the content, so there's no need to read it back
+    content = StaticContent(content_loc, filename, mime_type, upload_file.chunks())
     contentstore().save(content)
     del_cached_content(content.location)
 
-    # readback the saved content - we need the database timestamp
-    readback = contentstore().find(content.location)
+    # thumbnails are generated in the background; until then the asset has none
+    if _is_image(mime_type):
+        generate_asset_thumbnail.delay(content.location.url())
 
     locked = getattr(content, 'locked', False)
     response_payload = {
-        'asset': _get_asset_json(content.name, readback.last_modified_at, content.location, content.thumbnail_location, locked),
+        'asset': _get_asset_json(content.name, content.last_modified_at, content.location, content.thumbnail_location, locked),
         'msg': _('Upload completed')
     }
 
@@ -286,6 +267,13 @@ def _update_asset(request, location, asset_id):
             return JsonResponse(modified_asset, status=201)
 
 
+def _is_image(mime_type):
+    """
+    Whether a thumbnail can be generated for content of the given mime type.
+    """
+    return mime_type is not None and mime_type.split('/')[0] == 'image'
+
+
 def _get_asset_json(display_name, date, location, thumbnail_location, locked):
     """
     Helper method for formatting the asset information to send to client.
@@ -358,19 +358,14 @@ def _save_item(request, usage_loc, item_location, data=None, children=None, meta
     # Make public after updating the xblock, in case the caller asked
     # for both an update and a publish.
     if publish and publish == 'make_public':
-        def _publish(block):
-            # This is super gross, but prevents us from publishing something that
-            # we shouldn't. Ideally, all modulestores would have a consistant
-            # interface for publishing. However, as of now, only the DraftMongoModulestore
-            # does, so we have to check for the attribute explicitly.
-            store = get_modulestore(block.location)
-            if hasattr(store, 'publish'):
-                store.publish(block.location, request.user.id)
-
-        _xmodule_recurse(
-            existing_item,
-            _publish
-        )
+        # This is super gross, but prevents us from publishing something that
+        # we shouldn't. Ideally, all modulestores would have a consistant
+        # interface for publishing. However, as of now, only the DraftMongoModulestore
+        # does, so we have to check for the attribute explicitly.
+        store = modulestore()
+        if hasattr(store, 'publish_subtree'):
+            # publishes the whole subtree at once
+            store.publish_subtree(existing_item.location, request.user.id)
 
     # Note that children aren't being returned until we have a use case.
     return JsonResponse(result)
@@ -10,8 +10,11 @@ from datetime import datetime
 from io import BytesIO
 from pytz import UTC
 import json
+from mock import patch
+from PIL import Image
 from contentstore.tests.utils import CourseTestCase
 from contentstore.views import assets
+from contentstore.tasks import generate_asset_thumbnail
 from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore import Location
 from xmodule.contentstore.django import contentstore
@@ -133,6 +136,30 @@ class UploadTestCase(AssetsTestCase):
         resp = self.client.post(self.url, {"name": "file.txt"}, "application/json")
         self.assertEquals(resp.status_code, 400)
 
+    def test_image_thumbnail(self):
+        image = BytesIO()
+        Image.new('RGB', (200, 200)).save(image, 'PNG')
+        image.seek(0)
+        image.name = "image.png"
+        with patch.object(assets.generate_asset_thumbnail, 'delay') as mock_delay:
+            resp = self.client.post(self.url, {"name": "image", "file": image})
+        self.assertEquals(resp.status_code, 200)
+        # the thumbnail is generated in the background, so the upload doesn't report it
+        self.assertIsNone(json.loads(resp.content)['asset']['thumbnail'])
+        content_location = StaticContent.compute_location(self.course.location.org, self.course.location.course, "image.png")
+        mock_delay.assert_called_once_with(content_location.url())
+
+        generate_asset_thumbnail(content_location.url())
+        content = contentstore().find(content_location)
+        self.assertEquals(content.thumbnail_location.name, StaticContent.generate_thumbnail_name("image.png"))
+        self.assertIsNotNone(contentstore().find(content.thumbnail_location))
+
+    def test_no_thumbnail_for_other_content(self):
+        with patch.object(assets.generate_asset_thumbnail, 'delay') as mock_delay:
+            resp = self.upload_asset()
+        self.assertEquals(resp.status_code, 200)
+        self.assertFalse(mock_delay.called)
+
 
 class AssetToJsonTestCase(AssetsTestCase):
     """
@@ -6,7 +6,7 @@ from django.contrib.auth.models import User
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 from django.utils.translation import ugettext_noop
-from student.models import CourseEnrollment
+from student.models import CourseEnrollment, bulk_enroll_done
 
 from xmodule.modulestore.django import modulestore
 from xmodule.course_module import CourseDescriptor
@@ -39,6 +39,16 @@ def assign_default_role_on_enrollment(sender, instance, **kwargs):
     assign_default_role(instance.course_id, instance.user)
 
 
+@receiver(bulk_enroll_done)
+def assign_default_role_on_bulk_enrollment(sender, course_id, users, **kwargs):
+    """
+    Assign forum default role 'Student' to users enrolled together
+    """
+    if users:
+        role, __ = Role.objects.get_or_create(course_id=course_id, name="Student")
+        role.users.add(*users)
+
+
 def assign_default_role(course_id, user):
     """
     Assign forum default role 'Student' to user
@@ -1,6 +1,7 @@
 """
 Tests for the language setting view
 """
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 from student.tests.factories import UserFactory
@@ -12,6 +13,9 @@ class TestLanguageSetting(TestCase):
     """
     Test setting languages
     """
+    def setUp(self):
+        cache.clear()
+
     def test_set_preference_happy(self):
         user = UserFactory.create()
         self.client.login(username=user.username, password='test')
@@ -14,6 +14,9 @@ from django.conf import settings
 CURRENT_REQUEST_CONFIGURATION = threading.local()
 CURRENT_REQUEST_CONFIGURATION.data = {}
 
+# settings.MICROSITE_CONFIGURATION compiled into lookup structures, see compile_configuration
+_COMPILED_CONFIGURATION = {'source': None}
+
 
 def has_configuration_set():
     """
@@ -22,6 +25,66 @@ def has_configuration_set():
     return getattr(settings, "MICROSITE_CONFIGURATION", False)
 
 
+def compile_configuration():
+    """
+    Compiles settings.MICROSITE_CONFIGURATION into the structures used to resolve
+    microsites: a map of domain prefix -> microsite, a map of org -> microsite and
+    an index of the templates each microsite overrides.  With these, resolving a
+    request's microsite or a template path doesn't scan the configuration or
+    touch the filesystem.
+
+    This runs at startup, once the microsites are loaded, and again whenever the
+    configuration setting is replaced.  Templates added to a microsite's directory
+    afterwards aren't picked up until the next compile.
+    """
+    global _COMPILED_CONFIGURATION  # pylint: disable=global-statement
+
+    configuration = getattr(settings, "MICROSITE_CONFIGURATION", None)
+    by_prefix = {}
+    by_org = {}
+    templates = {}
+    for key, value in (configuration or {}).items():
+        prefix = value.get('domain_prefix')
+        if prefix:
+            by_prefix.setdefault(prefix, key)
+        org_filter = value.get('course_org_filter')
+        if org_filter:
+            by_org.setdefault(org_filter, key)
+        if value.get('template_dir'):
+            template_dir = str(value['template_dir'])
+            templates[template_dir] = _template_files(template_dir)
+
+    _COMPILED_CONFIGURATION = {
+        'source': configuration,
+        # longest prefixes first, so the most specific microsite wins
+        'prefix_lengths': sorted(set(len(prefix) for prefix in by_prefix), reverse=True),
+        'by_prefix': by_prefix,
+        'by_org': by_org,
+        'templates': templates,
+    }
+    return _COMPILED_CONFIGURATION
+
+
+def _compiled_configuration():
+    """
+    Returns the compiled microsite configuration, compiling it if the setting has changed
+    """
+    if _COMPILED_CONFIGURATION['source'] is not getattr(settings, "MICROSITE_CONFIGURATION", None):
+        return compile_configuration()
+    return _COMPILED_CONFIGURATION
+
+
+def _template_files(template_dir):
+    """
+    Returns the set of paths, relative to `template_dir`, of the templates in it
+    """
+    template_files = set()
+    for root, __, filenames in os.walk(template_dir):
+        for filename in filenames:
+            template_files.add(os.path.relpath(os.path.join(root, filename), template_dir))
+    return template_files
+
+
 def get_configuration():
     """
     Returns the current request's microsite configuration
@@ -60,9 +123,9 @@ def get_template_path(relative_path):
     microsite_template_path = str(get_value('template_dir'))
 
     if microsite_template_path:
-        search_path = os.path.join(microsite_template_path, relative_path)
+        template_files = _compiled_configuration()['templates'].get(microsite_template_path, ())
 
-        if os.path.isfile(search_path):
+        if os.path.normpath(relative_path) in template_files:
             path = '{0}/templates/{1}'.format(
                 get_value('microsite_name'),
                 relative_path
@@ -80,11 +143,10 @@ def get_value_for_org(org, val_name, default=None):
     if not has_configuration_set():
         return default
 
-    for value in settings.MICROSITE_CONFIGURATION.values():
-        org_filter = value.get('course_org_filter', None)
-        if org_filter == org:
-            return value.get(val_name, default)
-    return default
+    key = _compiled_configuration()['by_org'].get(org)
+    if key is None:
+        return default
+    return settings.MICROSITE_CONFIGURATION[key].get(val_name, default)
 
 
 def get_all_orgs():
@@ -92,16 +154,10 @@ def get_all_orgs():
     This returns a set of orgs that are considered within a microsite. This can be used,
     for example, to do filtering
     """
-    org_filter_set = set()
     if not has_configuration_set():
-        return org_filter_set
-
-    for value in settings.MICROSITE_CONFIGURATION.values():
-        org_filter = value.get('course_org_filter')
-        if org_filter:
-            org_filter_set.add(org_filter)
+        return set()
 
-    return org_filter_set
+    return set(_compiled_configuration()['by_org'])
 
 
 def clear():
@@ -130,13 +186,15 @@ def set_by_domain(domain):
     if not has_configuration_set() or not domain:
         return
 
-    for key, value in settings.MICROSITE_CONFIGURATION.items():
-        subdomain = value.get('domain_prefix')
-        if subdomain and domain.startswith(subdomain):
+    compiled = _compiled_configuration()
+    for length in compiled['prefix_lengths']:
+        subdomain = domain[:length]
+        key = compiled['by_prefix'].get(subdomain)
+        if key is not None:
             _set_current_microsite(key, subdomain, domain)
             return
 
     # if no match on subdomain then see if there is a 'default' microsite defined
     # if so, then use that
     if 'default' in settings.MICROSITE_CONFIGURATION:
-        _set_current_microsite('default', subdomain, domain)
+        _set_current_microsite('default', settings.MICROSITE_CONFIGURATION['default'].get('domain_prefix'), domain)
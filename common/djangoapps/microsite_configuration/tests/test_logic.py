@@ -4,6 +4,7 @@ some additional coverage
 """
 import django.test
 
+from microsite_configuration import microsite
 from microsite_configuration.microsite import get_value_for_org
 
 
@@ -24,3 +25,33 @@ class TestMicrosites(django.test.TestCase):
         # now test when we call in a value Microsite ORG, note this is defined in test.py configuration
         value = get_value_for_org("TestMicrositeX", "university", "default_value")
         self.assertEquals(value, "test_microsite")
+
+    def test_get_all_orgs(self):
+        self.assertEquals(microsite.get_all_orgs(), set(["TestMicrositeX"]))
+
+    def test_set_by_domain(self):
+        """
+        Make sure requests are matched to microsites by their domain prefix
+        """
+        self.addCleanup(microsite.clear)
+
+        microsite.set_by_domain("testmicrosite.example.com")
+        self.assertEquals(microsite.get_value("university"), "test_microsite")
+        self.assertEquals(microsite.get_value("subdomain"), "testmicrosite")
+
+        # unmatched domains get the default microsite
+        microsite.set_by_domain("bogus.example.com")
+        self.assertEquals(microsite.get_value("university"), "default_university")
+
+    def test_get_template_path(self):
+        """
+        Make sure only the templates a microsite overrides come from its directory
+        """
+        self.addCleanup(microsite.clear)
+        microsite.set_by_domain("testmicrosite.example.com")
+
+        self.assertEquals(
+            microsite.get_template_path("emails/activation_email.txt"),
+            "test_microsite/templates/emails/activation_email.txt"
+        )
+        self.assertEquals(microsite.get_template_path("courseware/courses.html"), "courseware/courses.html")
@@ -28,6 +28,53 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+# Compiled url replacement regexes, keyed by prefix. The prefixes depend only on
+# settings and course data directories, so this stays small.
+_URL_REPLACE_REGEXES = {}
+
+
+def _compiled_url_replace_regex(prefix):
+    """
+    Return the compiled form of `_url_replace_regex(prefix)`.
+    """
+    regex = _URL_REPLACE_REGEXES.get(prefix)
+    if regex is None:
+        regex = re.compile(_url_replace_regex(prefix))
+        _URL_REPLACE_REGEXES[prefix] = regex
+    return regex
+
+
+# Most entries each of the lookup caches below holds before it is emptied
+_LOOKUP_CACHE_SIZE = 10000
+
+# Whether each course is stored in an XML modulestore, keyed by (modulestore,
+# course id).  The store a course lives in only changes with the settings, which
+# replace the modulestore.
+_IS_XML_COURSE = {}
+
+# Whether each path exists in staticfiles_storage, keyed by path.  The static
+# files only change when the code is deployed.  Whether a path exists doesn't
+# depend on the course, so the course isn't part of the key.
+_STATICFILES_EXIST = {}
+
+
+def _cache_lookup(cache, key, value):
+    """
+    Store `value` under `key` in the lookup `cache`, emptying it first if it's full.
+    """
+    if len(cache) >= _LOOKUP_CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+
+
+def _clear_lookup_caches():
+    """
+    Empty the lookup caches (for tests).
+    """
+    _IS_XML_COURSE.clear()
+    _STATICFILES_EXIST.clear()
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -69,7 +116,11 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    # Most fragments don't contain any such links, so don't scan them with the regex
+    if '/jump_to_id/' not in text:
+        return text
+
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_id):
@@ -87,7 +138,11 @@ def replace_course_urls(text, course_id):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    # Most fragments don't contain any such links, so don't scan them with the regex
+    if '/course/' not in text:
+        return text
+
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def replace_static_urls(text, data_directory, course_id=None, static_asset_path=''):
@@ -103,6 +158,37 @@ def replace_static_urls(text, data_directory, course_id=None, static_asset_path=
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
 
+    # The course's store type and whether paths exist are cached for the process
+    # (see _IS_XML_COURSE and _STATICFILES_EXIST), since every component of a page
+    # is rewritten separately and they often reference the same assets.  Failed
+    # existence checks are only remembered for this call.
+    failed_lookups = {}
+
+    def is_xml_course():
+        """
+        Return whether the course is stored in an XML modulestore.
+        """
+        store = modulestore()
+        key = (store, course_id)
+        if key not in _IS_XML_COURSE:
+            _cache_lookup(_IS_XML_COURSE, key, store.get_modulestore_type(course_id) == XML_MODULESTORE_TYPE)
+        return _IS_XML_COURSE[key]
+
+    def storage_exists(path):
+        """
+        Return whether `path` exists in staticfiles_storage (raising any exception it raises).
+        """
+        if path in failed_lookups:
+            raise failed_lookups[path]
+        if path not in _STATICFILES_EXIST:
+            try:
+                exists = staticfiles_storage.exists(path)
+            except Exception as err:  # pylint: disable=broad-except
+                failed_lookups[path] = err
+                raise
+            _cache_lookup(_STATICFILES_EXIST, path, exists)
+        return _STATICFILES_EXIST[path]
+
     def replace_static_url(match):
         original = match.group(0)
         prefix = match.group('prefix')
@@ -117,13 +203,13 @@ def replace_static_urls(text, data_directory, course_id=None, static_asset_path=
         if settings.DEBUG and finders.find(rest, True):
             return original
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id and modulestore().get_modulestore_type(course_id) != XML_MODULESTORE_TYPE:
+        elif (not static_asset_path) and course_id and not is_xml_course():
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
             exists_in_staticfiles_storage = False
             try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                exists_in_staticfiles_storage = storage_exists(rest)
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
                     rest, str(err)))
@@ -139,7 +225,7 @@ def replace_static_urls(text, data_directory, course_id=None, static_asset_path=
             course_path = "/".join((static_asset_path or data_directory, rest))
 
             try:
-                if staticfiles_storage.exists(rest):
+                if storage_exists(rest):
                     url = staticfiles_storage.url(rest)
                 else:
                     url = staticfiles_storage.url(course_path)
@@ -151,11 +237,11 @@ def replace_static_urls(text, data_directory, course_id=None, static_asset_path=
 
         return "".join([quote, url, quote])
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=static_asset_path or data_directory
-        )),
-        replace_static_url,
-        text
-    )
+    # Most fragments don't contain any static urls, so don't scan them with the regex
+    if '/static/' not in text and settings.STATIC_URL not in text:
+        return text
+
+    return _compiled_url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=static_asset_path or data_directory
+    )).sub(replace_static_url, text)
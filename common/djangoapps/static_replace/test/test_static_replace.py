@@ -1,8 +1,8 @@
 import re
 
-from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=E0611
+from nose.tools import assert_equals, assert_true, assert_false, with_setup  # pylint: disable=E0611
 from static_replace import (replace_static_urls, replace_course_urls,
-                            _url_replace_regex)
+                            replace_jump_to_id_urls, _url_replace_regex, _clear_lookup_caches)
 from mock import patch, Mock
 from xmodule.modulestore import Location
 from xmodule.modulestore.mongo import MongoModuleStore
@@ -26,6 +26,7 @@ def test_multi_replace():
     )
 
 
+@with_setup(_clear_lookup_caches)
 @patch('static_replace.staticfiles_storage')
 def test_storage_url_exists(mock_storage):
     mock_storage.exists.return_value = True
@@ -36,6 +37,7 @@ def test_storage_url_exists(mock_storage):
     mock_storage.url.called_once_with('data_dir/file.png')
 
 
+@with_setup(_clear_lookup_caches)
 @patch('static_replace.staticfiles_storage')
 def test_storage_url_not_exists(mock_storage):
     mock_storage.exists.return_value = False
@@ -46,6 +48,50 @@ def test_storage_url_not_exists(mock_storage):
     mock_storage.url.called_once_with('file.png')
 
 
+@with_setup(_clear_lookup_caches)
+@patch('static_replace.modulestore')
+@patch('static_replace.staticfiles_storage')
+def test_lookups_once_per_fragment(mock_storage, mock_modulestore):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.png'
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    mock_modulestore.return_value.get_modulestore_type.return_value = 'mongo'
+
+    assert_equals(
+        '"/static/file.png" "/static/file.png"',
+        replace_static_urls(STATIC_SOURCE + ' ' + STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_ID)
+    )
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_modulestore.return_value.get_modulestore_type.assert_called_once_with(COURSE_ID)
+
+
+@with_setup(_clear_lookup_caches)
+@patch('static_replace.modulestore')
+@patch('static_replace.staticfiles_storage')
+def test_lookups_cached_across_fragments(mock_storage, mock_modulestore):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.png'
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    mock_modulestore.return_value.get_modulestore_type.return_value = 'mongo'
+
+    # e.g. the components of a vertical, each rewritten on its own
+    for __ in range(3):
+        assert_equals('"/static/file.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_ID))
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_modulestore.return_value.get_modulestore_type.assert_called_once_with(COURSE_ID)
+
+
+@with_setup(_clear_lookup_caches)
+@patch('static_replace.staticfiles_storage')
+def test_no_urls_to_replace(mock_storage):
+    text = '<p>Nothing "to" replace</p>'
+    assert_equals(text, replace_static_urls(text, DATA_DIRECTORY))
+    assert_equals(text, replace_course_urls(text, COURSE_ID))
+    assert_equals(text, replace_jump_to_id_urls(text, COURSE_ID, '/jump_to_id/'))
+    assert_false(mock_storage.exists.called)
+
+
+@with_setup(_clear_lookup_caches)
 @patch('static_replace.StaticContent')
 @patch('static_replace.modulestore')
 def test_mongo_filestore(mock_modulestore, mock_static_content):
@@ -65,6 +111,7 @@ def test_mongo_filestore(mock_modulestore, mock_static_content):
     mock_static_content.convert_legacy_static_url_with_course_id.assert_called_once_with('file.png', COURSE_ID)
 
 
+@with_setup(_clear_lookup_caches)
 @patch('static_replace.settings')
 @patch('static_replace.modulestore')
 @patch('static_replace.staticfiles_storage')
@@ -75,6 +122,7 @@ def test_data_dir_fallback(mock_storage, mock_modulestore, mock_settings):
     mock_storage.exists.return_value = True
     assert_equals('"/static/data_dir/file.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY))
 
+    _clear_lookup_caches()
     mock_storage.exists.return_value = False
     assert_equals('"/static/data_dir/file.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY))
 
@@ -90,6 +138,7 @@ def test_raw_static_check():
     assert_equals(path, replace_static_urls(path, text))
 
 
+@with_setup(_clear_lookup_caches)
 @patch('static_replace.staticfiles_storage')
 @patch('static_replace.modulestore')
 def test_static_url_with_query(mock_modulestore, mock_storage):
@@ -0,0 +1,39 @@
+"""
+Recount the active enrollments in courses and correct the stored enrollment counts.
+
+The counts are kept up to date as students enroll, so this only needs to run
+periodically (e.g. from cron) to fix up anything that changed enrollments
+without going through CourseEnrollment.  To run, use the following:
+
+./manage.py lms reconcile_enrollment_counts [COURSE_ID ...]
+
+With no course ids, every course with enrollments or counts is reconciled.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from student.models import CourseEnrollment, CourseEnrollmentCount
+
+
+class Command(BaseCommand):
+    """Add our handler to the space where django-admin looks up commands."""
+
+    args = "[course_id ...]"
+    help = "Recounts the active enrollments in courses and corrects the stored enrollment counts"
+
+    def handle(self, *args, **options):
+        if args:
+            course_ids = args
+        else:
+            course_ids = set(
+                CourseEnrollment.objects.values_list('course_id', flat=True).distinct()
+            )
+            course_ids.update(
+                CourseEnrollmentCount.objects.values_list('course_id', flat=True).distinct()
+            )
+
+        for course_id in sorted(course_ids):
+            # hold the count rows' lock while recounting the course
+            with transaction.commit_on_success():
+                counts = CourseEnrollmentCount.reconcile(course_id)
+            self.stdout.write(u"{}: {}\n".format(course_id, sum(counts.itervalues())))
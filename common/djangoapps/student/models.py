@@ -23,7 +23,7 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.db import models, IntegrityError
-from django.db.models import Count
+from django.db.models import Count, F
 from django.db.models.signals import post_save
 from django.dispatch import receiver, Signal
 import django.dispatch
@@ -32,14 +32,17 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
 from django_countries import CountryField
 from track import contexts
+from util.db import all_or_nothing
+from util.query import use_read_replica_if_available
 from track.views import server_track
 from eventtracking import tracker
 
 from course_modes.models import CourseMode
 import lms.lib.comment_client as cc
-from util.query import use_read_replica_if_available
 
 unenroll_done = Signal(providing_args=["course_enrollment"])
+# Sent by CourseEnrollment.enroll_users, whose bulk writes don't send post_save for each enrollment
+bulk_enroll_done = Signal(providing_args=["course_id", "users"])
 log = logging.getLogger(__name__)
 AUDIT_LOG = logging.getLogger("audit")
 
@@ -439,9 +442,7 @@ class CourseEnrollment(models.Model):
 
         'course_id' is the course_id to return enrollments
         """
-        enrollment_number = CourseEnrollment.objects.filter(course_id=course_id, is_active=1).count()
-
-        return enrollment_number
+        return sum(CourseEnrollmentCount.counts_for(course_id).itervalues())
 
     @classmethod
     def is_course_full(cls, course):
@@ -463,6 +464,7 @@ class CourseEnrollment(models.Model):
 
         This saves immediately.
         """
+        was_active, old_mode = self.is_active, self.mode
         activation_changed = False
         # if is_active is None, then the call to update_enrollment didn't specify
         # any value, so just leave is_active as it is
@@ -479,6 +481,12 @@ class CourseEnrollment(models.Model):
 
         if activation_changed or mode_changed:
             self.save()
+            deltas = defaultdict(int)
+            if was_active:
+                deltas[old_mode] -= 1
+            if self.is_active:
+                deltas[self.mode] += 1
+            CourseEnrollmentCount.adjust(self.course_id, deltas)
         if activation_changed:
             if self.is_active:
                 self.emit_event(EVENT_NAME_ENROLLMENT_ACTIVATED)
@@ -605,6 +613,113 @@ class CourseEnrollment(models.Model):
             err_msg = u"Tried to unenroll email {} from course {}, but user not found"
             log.error(err_msg.format(email, course_id))
 
+    @classmethod
+    def enroll_users(cls, users, course_id, mode="honor"):
+        """
+        Enroll many users in a course at once, as `enroll` would each of them,
+        but with a handful of queries rather than several per user. This saves
+        immediately.
+
+        Returns a list of the users' CourseEnrollment objects, in the order of `users`.
+
+        `users` is an iterable of saved Django User objects.
+
+        `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+
+        `mode` is a string specifying what kind of enrollment this is (see `enroll`).
+
+        It is expected that this method is called from a method which has already
+        verified the user authentication and access.
+        """
+        users = list(users)
+        enrollments = dict(
+            (enrollment.user_id, enrollment)
+            for enrollment in CourseEnrollment.objects.filter(
+                course_id=course_id, user__in=users
+            ).select_related('user')
+        )
+
+        activated = []
+        changed_ids = []
+        deltas = defaultdict(int)
+        for enrollment in enrollments.itervalues():
+            if not enrollment.is_active:
+                activated.append(enrollment)
+            if not enrollment.is_active or enrollment.mode != mode:
+                if enrollment.is_active:
+                    deltas[enrollment.mode] -= 1
+                deltas[mode] += 1
+                enrollment.is_active = True
+                enrollment.mode = mode
+                changed_ids.append(enrollment.id)
+
+        new_users = []
+        for user in users:
+            if user.id not in enrollments:
+                new_users.append(user)
+                enrollments[user.id] = CourseEnrollment(user=user, course_id=course_id, mode=mode, is_active=True)
+        activated.extend(enrollments[user.id] for user in new_users)
+        deltas[mode] += len(new_users)
+
+        # enroll all the users or none of them, so that a retry sees them unenrolled
+        with all_or_nothing():
+            if changed_ids:
+                CourseEnrollment.objects.filter(id__in=changed_ids).update(is_active=True, mode=mode)
+            if new_users:
+                CourseEnrollment.objects.bulk_create([enrollments[user.id] for user in new_users])
+            CourseEnrollmentCount.adjust(course_id, deltas)
+
+            if changed_ids or new_users:
+                bulk_enroll_done.send(
+                    sender=None,
+                    course_id=course_id,
+                    users=new_users + [enrollment.user for enrollment in enrollments.itervalues() if enrollment.id in changed_ids],
+                )
+        for enrollment in activated:
+            enrollment.emit_event(EVENT_NAME_ENROLLMENT_ACTIVATED)
+
+        return [enrollments[user.id] for user in users]
+
+    @classmethod
+    def unenroll_users(cls, users, course_id):
+        """
+        Remove many users from a given course at once, as `unenroll` would each
+        of them. Users who aren't enrolled are logged but don't raise an exception.
+
+        `users` is an iterable of saved Django User objects.
+
+        `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+        """
+        users = list(users)
+        enrollments = dict(
+            (enrollment.user_id, enrollment)
+            for enrollment in CourseEnrollment.objects.filter(
+                course_id=course_id, user__in=users
+            ).select_related('user')
+        )
+        for user in users:
+            if user.id not in enrollments:
+                err_msg = u"Tried to unenroll student {} from {} but they were not enrolled"
+                log.error(err_msg.format(user, course_id))
+
+        deactivated = [enrollment for enrollment in enrollments.itervalues() if enrollment.is_active]
+        deltas = defaultdict(int)
+        for enrollment in deactivated:
+            deltas[enrollment.mode] -= 1
+
+        # unenroll all the users or none of them, so that a retry sees them enrolled
+        with all_or_nothing():
+            if deactivated:
+                CourseEnrollment.objects.filter(
+                    id__in=[enrollment.id for enrollment in deactivated]
+                ).update(is_active=False)
+            CourseEnrollmentCount.adjust(course_id, deltas)
+            for enrollment in deactivated:
+                enrollment.is_active = False
+                unenroll_done.send(sender=None, course_enrollment=enrollment)
+        for enrollment in deactivated:
+            enrollment.emit_event(EVENT_NAME_ENROLLMENT_DEACTIVATED)
+
     @classmethod
     def is_enrolled(cls, user, course_id):
         """
@@ -683,13 +798,12 @@ class CourseEnrollment(models.Model):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
-        # Unfortunately, Django's "group by"-style queries look super-awkward
-        query = use_read_replica_if_available(cls.objects.filter(course_id=course_id, is_active=True).values('mode').order_by().annotate(Count('mode')))
         total = 0
         d = defaultdict(int)
-        for item in query:
-            d[item['mode']] = item['mode__count']
-            total += item['mode__count']
+        for mode, count in CourseEnrollmentCount.counts_for(course_id).iteritems():
+            if count:
+                d[mode] = count
+                total += count
         d['total'] = total
         return d
 
@@ -737,6 +851,102 @@ class CourseEnrollmentAllowed(models.Model):
     def __unicode__(self):
         return "[CourseEnrollmentAllowed] %s: %s (%s)" % (self.email, self.course_id, self.created)
 
+class CourseEnrollmentCount(models.Model):
+    """
+    The number of active enrollments in each mode of a course, kept up to date
+    as students enroll, unenroll and change modes so that reading it doesn't
+    have to count the enrollment table.  Read it through
+    `CourseEnrollment.num_enrolled_in` and `CourseEnrollment.enrollment_counts`.
+
+    The counts are adjusted in the same transaction as the enrollment change.
+    Anything that changes enrollments without going through CourseEnrollment
+    should be followed by `reconcile` (see the reconcile_enrollment_counts
+    management command).
+    """
+    course_id = models.CharField(max_length=255, db_index=True)
+    mode = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'mode'),)
+
+    def __unicode__(self):
+        return "[CourseEnrollmentCount] {}: {} ({})".format(self.course_id, self.mode, self.count)
+
+    @classmethod
+    def counts_for(cls, course_id):
+        """
+        Returns a dict of mode -> number of active enrollments in `course_id`.
+        Modes nobody has enrolled in may be missing or have a count of 0.
+
+        Courses which haven't been counted yet are counted from the enrollment
+        table, without storing the counts: that's left to the next enrollment
+        change or reconcile.  Both are read from the read replica if there is one.
+        """
+        counts = dict(
+            use_read_replica_if_available(cls.objects.filter(course_id=course_id)).values_list('mode', 'count')
+        )
+        if not counts:
+            counts = cls._count(course_id, use_read_replica=True)
+        return counts
+
+    @classmethod
+    def adjust(cls, course_id, deltas):
+        """
+        Adds the changes in `deltas` (a dict of mode -> change in count) to
+        the counts for `course_id`, after the enrollments have been saved.  If a
+        mode hasn't been counted yet the course is recounted instead, which
+        already includes the change.
+        """
+        for mode, delta in deltas.iteritems():
+            if not delta:
+                continue
+            updated = cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + delta)
+            if not updated:
+                cls.reconcile(course_id)
+                return
+
+    @classmethod
+    def reconcile(cls, course_id):
+        """
+        Recounts the active enrollments in `course_id` from the enrollment table
+        and stores the counts.  Returns a dict of mode -> count.
+
+        The course's count rows are locked before recounting, so an `adjust`
+        made meanwhile waits for the new counts rather than being overwritten
+        by them.  Call this inside a transaction, as the lock lasts until it
+        ends.
+        """
+        existing = set(
+            cls.objects.select_for_update().filter(course_id=course_id).values_list('mode', flat=True)
+        )
+        counts = cls._count(course_id)
+        for mode in existing:
+            cls.objects.filter(course_id=course_id, mode=mode).update(count=counts.get(mode, 0))
+        for mode, count in counts.iteritems():
+            if mode not in existing:
+                try:
+                    cls.objects.create(course_id=course_id, mode=mode, count=count)
+                except IntegrityError:
+                    # another request started counting this mode at the same time
+                    cls.objects.filter(course_id=course_id, mode=mode).update(count=count)
+        return counts
+
+    @staticmethod
+    def _count(course_id, use_read_replica=False):
+        """
+        Counts the active enrollments in `course_id` from the enrollment table,
+        on the read replica if `use_read_replica` and there is one.
+        Returns a dict of mode -> count.
+        """
+        enrollments = CourseEnrollment.objects.filter(course_id=course_id, is_active=True)
+        if use_read_replica:
+            enrollments = use_read_replica_if_available(enrollments)
+        # Unfortunately, Django's "group by"-style queries look super-awkward
+        query = enrollments.values('mode').order_by().annotate(Count('mode'))
+        return dict((item['mode'], item['mode__count']) for item in query)
+
+
 # cache_relation(User.profile)
 
 #### Helper methods for use from python manage.py shell and other classes.
@@ -14,6 +14,7 @@ import pytz
 from django.core.cache import cache
 from django.conf import settings
 from django.test import TestCase
+from django.test.testcases import skipUnlessDBFeature
 from django.test.utils import override_settings
 from django.test.client import RequestFactory
 from django.contrib.auth.models import User, AnonymousUser
@@ -30,7 +31,8 @@ from courseware.tests.tests import TEST_DATA_MIXED_MODULESTORE
 from mock import Mock, patch, sentinel
 from textwrap import dedent
 
-from student.models import anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, unique_id_for_user
+from student.models import (anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, CourseEnrollmentCount,
+                            unique_id_for_user)
 from student.views import (process_survey_link, _cert_info, password_reset, password_reset_confirm_wrapper,
                            change_enrollment, complete_course_mode_info, token, course_from_id)
 from student.tests.factories import UserFactory, CourseModeFactory
@@ -381,6 +383,74 @@ class EnrollInCourseTest(TestCase):
         self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
         self.assertEquals(enrollment.mode, "audit")
 
+    def test_bulk_enrollment(self):
+        users = [User.objects.create_user(name, name + "@joe.com", "password") for name in ("joe", "jim", "jan")]
+        course_id = "edX/Test101/2013"
+        CourseEnrollment.enroll(users[0], course_id)
+        CourseEnrollment.enroll(users[1], course_id, "verified")
+        CourseEnrollment.unenroll(users[1], course_id)
+        self.mock_server_track.reset_mock()
+
+        enrollments = CourseEnrollment.enroll_users(users, course_id)
+        self.assertEqual([enrollment.user for enrollment in enrollments], users)
+        for user in users:
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_id), "honor")
+            # enrolled users get the forum's default role
+            self.assertTrue(user.roles.filter(course_id=course_id, name="Student").exists())
+        # only the users who weren't already enrolled get an event
+        self.assertEqual(self.mock_server_track.call_count, 2)
+        self.mock_server_track.reset_mock()
+
+        CourseEnrollment.unenroll_users(users[1:], course_id)
+        self.assertTrue(CourseEnrollment.is_enrolled(users[0], course_id))
+        self.assertFalse(CourseEnrollment.is_enrolled(users[1], course_id))
+        self.assertFalse(CourseEnrollment.is_enrolled(users[2], course_id))
+        self.assertEqual(self.mock_server_track.call_count, 2)
+
+    @skipUnlessDBFeature('uses_savepoints')
+    def test_bulk_enrollment_rolled_back(self):
+        users = [User.objects.create_user(name, name + "@joe.com", "password") for name in ("joe", "jim")]
+        course_id = "edX/Test101/2013"
+        CourseEnrollment.enroll(users[0], course_id)
+        CourseEnrollment.unenroll(users[0], course_id)
+        self.mock_server_track.reset_mock()
+
+        # if enrolling fails partway, none of the users is enrolled
+        with patch('student.models.bulk_enroll_done.send', side_effect=Exception):
+            with self.assertRaises(Exception):
+                CourseEnrollment.enroll_users(users, course_id)
+        self.assertFalse(CourseEnrollment.is_enrolled(users[0], course_id))
+        self.assertFalse(CourseEnrollment.is_enrolled(users[1], course_id))
+        self.assert_no_events_were_emitted()
+
+    def test_enrollment_counts(self):
+        users = [User.objects.create_user(name, name + "@joe.com", "password") for name in ("joe", "jim", "jan")]
+        course_id = "edX/Test101/2013"
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 0)
+        # reading the counts doesn't store them
+        self.assertFalse(CourseEnrollmentCount.objects.filter(course_id=course_id).exists())
+
+        CourseEnrollment.enroll(users[0], course_id)
+        CourseEnrollment.enroll(users[1], course_id, "verified")
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 2)
+
+        CourseEnrollment.enroll(users[1], course_id, "honor")
+        CourseEnrollment.enroll_users(users, course_id, "verified")
+        CourseEnrollment.unenroll(users[0], course_id)
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 2)
+        self.assertEqual(CourseEnrollment.enrollment_counts(course_id), {'verified': 2, 'total': 2})
+
+        # the counts are read without counting the enrollment table
+        with self.assertNumQueries(1):
+            self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 2)
+
+        # changes behind CourseEnrollment's back are picked up by reconciling
+        CourseEnrollment.objects.filter(course_id=course_id).update(is_active=True, mode="honor")
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 2)
+        self.assertEqual(CourseEnrollmentCount.reconcile(course_id), {'honor': 3})
+        self.assertEqual(CourseEnrollment.enrollment_counts(course_id), {'honor': 3, 'total': 3})
+
     def assert_no_events_were_emitted(self):
         """Ensures no events were emitted since the last event related assertion"""
         self.assertFalse(self.mock_server_track.called)
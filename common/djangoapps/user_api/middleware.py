@@ -4,7 +4,7 @@ Adds user's tags to tracking event context.
 """
 from track.contexts import COURSE_REGEX
 from eventtracking import tracker
-from user_api.models import UserCourseTag
+from user_api.user_service import get_course_tags
 
 
 class UserTagsEventContextMiddleware(object):
@@ -26,12 +26,7 @@ class UserTagsEventContextMiddleware(object):
             context['course_id'] = course_id
 
             if request.user.is_authenticated():
-                context['course_user_tags'] = dict(
-                    UserCourseTag.objects.filter(
-                        user=request.user.pk,
-                        course_id=course_id
-                    ).values_list('key', 'value')
-                )
+                context['course_user_tags'] = get_course_tags(request.user.pk, course_id)
             else:
                 context['course_user_tags'] = {}
 
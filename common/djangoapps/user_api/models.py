@@ -1,6 +1,17 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from util.db import delete_from_cache_on_commit
+
+# How long (in seconds) a user's preferences are cached
+PREFERENCES_CACHE_TIMEOUT = 60
+
+# How long (in seconds) a user's course tags are cached
+COURSE_TAGS_CACHE_TIMEOUT = 60
 
 
 class UserPreference(models.Model):
@@ -13,6 +24,13 @@ class UserPreference(models.Model):
     class Meta:  # pylint: disable=missing-docstring
         unique_together = ("user", "key")
 
+    @staticmethod
+    def cache_key(user_id):
+        """
+        Returns the key under which the user's preferences are cached
+        """
+        return u"user_api.preferences.{}".format(user_id)
+
     @classmethod
     def set_preference(cls, user, preference_key, preference_value):
         """
@@ -29,12 +47,55 @@ class UserPreference(models.Model):
 
         Returns the given default if there isn't a preference for the given key
         """
+        return cls.get_preferences(user.id).get(preference_key, default)
+
+    @classmethod
+    def get_preferences(cls, user_id):
+        """
+        Gets all of the preferences of a user, as a dict of key -> value
+
+        The preferences are cached until one of them changes (for at most
+        PREFERENCES_CACHE_TIMEOUT seconds), as several of them are often read
+        while handling the same request.
+        """
+        cache_key = cls.cache_key(user_id)
+        preferences = cache.get(cache_key)
+        if preferences is None:
+            preferences = dict(cls.objects.filter(user=user_id).values_list('key', 'value'))
+            cache.set(cache_key, preferences, PREFERENCES_CACHE_TIMEOUT)
+        return preferences
+
+    @classmethod
+    def get_preference_for_users(cls, user_ids, preference_key):
+        """
+        Gets the value of one preference for many users at once
 
-        try:
-            user_pref = cls.objects.get(user=user, key=preference_key)
-            return user_pref.value
-        except cls.DoesNotExist:
-            return default
+        Returns a dict of user id -> value, without the users who don't have
+        the preference.
+        """
+        user_ids = set(user_ids)
+        cached = cache.get_many([cls.cache_key(user_id) for user_id in user_ids])
+        values = {}
+        for user_id in list(user_ids):
+            preferences = cached.get(cls.cache_key(user_id))
+            if preferences is not None:
+                if preference_key in preferences:
+                    values[user_id] = preferences[preference_key]
+                user_ids.discard(user_id)
+        if user_ids:
+            values.update(
+                cls.objects.filter(user__in=user_ids, key=preference_key).values_list('user', 'value')
+            )
+        return values
+
+
+@receiver(post_save, sender=UserPreference)
+@receiver(post_delete, sender=UserPreference)
+def forget_cached_preferences(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the cached preferences of the user whenever one of them changes
+    """
+    delete_from_cache_on_commit(UserPreference.cache_key(instance.user_id))
 
 
 class UserCourseTag(models.Model):
@@ -49,3 +110,19 @@ class UserCourseTag(models.Model):
 
     class Meta:  # pylint: disable=missing-docstring
         unique_together = ("user", "course_id", "key")
+
+    @staticmethod
+    def cache_key(user_id, course_id):
+        """
+        Returns the key under which the user's tags in the course are cached
+        """
+        return u"user_api.course_tags.{}.{}".format(user_id, course_id)
+
+
+@receiver(post_save, sender=UserCourseTag)
+@receiver(post_delete, sender=UserCourseTag)
+def forget_cached_course_tags(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the cached tags of the user in the course whenever one of them changes
+    """
+    delete_from_cache_on_commit(UserCourseTag.cache_key(instance.user_id, instance.course_id))
@@ -2,6 +2,7 @@
 from mock import Mock, patch
 from unittest import TestCase
 
+from django.core.cache import cache
 from django.http import HttpResponse
 from django.test.client import RequestFactory
 
@@ -15,6 +16,7 @@ class TagsMiddlewareTest(TestCase):
     Test the UserTagsEventContextMiddleware
     """
     def setUp(self):
+        cache.clear()
         self.middleware = UserTagsEventContextMiddleware()
         self.user = UserFactory.create()
         self.other_user = UserFactory.create()
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.db import IntegrityError
 from django.test import TestCase
 from student.tests.factories import UserFactory
@@ -6,6 +7,9 @@ from user_api.models import UserPreference
 
 
 class UserPreferenceModelTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_duplicate_user_key(self):
         user = UserFactory.create()
         UserPreferenceFactory.create(user=user, key="testkey", value="first")
@@ -45,3 +49,32 @@ class UserPreferenceModelTest(TestCase):
         # get preference for key that doesn't exist for user
         pref = UserPreference.get_preference(user, 'testkey_none')
         self.assertIsNone(pref)
+
+    def test_preferences_cached(self):
+        user = UserFactory.create()
+        UserPreference.set_preference(user, 'testkey', 'first')
+
+        # all of a user's preferences are read in one query, then cached
+        with self.assertNumQueries(1):
+            self.assertEqual(UserPreference.get_preference(user, 'testkey'), 'first')
+            self.assertIsNone(UserPreference.get_preference(user, 'otherkey'))
+        with self.assertNumQueries(0):
+            self.assertEqual(UserPreference.get_preference(user, 'testkey'), 'first')
+
+        # changing or deleting a preference drops the cached ones
+        UserPreference.set_preference(user, 'testkey', 'second')
+        self.assertEqual(UserPreference.get_preference(user, 'testkey'), 'second')
+        UserPreference.objects.filter(user=user, key='testkey').delete()
+        self.assertIsNone(UserPreference.get_preference(user, 'testkey'))
+
+    def test_get_preference_for_users(self):
+        users = [UserFactory.create() for _ in range(3)]
+        UserPreference.set_preference(users[0], 'testkey', 'zero')
+        UserPreference.set_preference(users[1], 'testkey', 'one')
+        UserPreference.set_preference(users[1], 'otherkey', 'other')
+
+        # users whose preferences are cached don't need to be queried
+        UserPreference.get_preferences(users[0].id)
+        with self.assertNumQueries(1):
+            values = UserPreference.get_preference_for_users([user.id for user in users], 'testkey')
+        self.assertEqual(values, {users[0].id: 'zero', users[1].id: 'one'})
@@ -1,6 +1,7 @@
 """
 Test the user service
 """
+from django.core.cache import cache
 from django.test import TestCase
 
 from student.tests.factories import UserFactory
@@ -12,6 +13,7 @@ class TestUserService(TestCase):
     Test the user service
     """
     def setUp(self):
+        cache.clear()
         self.user = UserFactory.create()
         self.course_id = 'test_org/test_course_number/test_run'
         self.test_key = 'test_key'
@@ -32,3 +34,17 @@ class TestUserService(TestCase):
         user_service.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = user_service.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_course_tags_cached(self):
+        user_service.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        self.assertEqual(user_service.get_course_tags(self.user.id, self.course_id), {self.test_key: 'value'})
+
+        # the tags are read from the cache until one of them changes
+        with self.assertNumQueries(0):
+            self.assertEqual(user_service.get_course_tag(self.user, self.course_id, self.test_key), 'value')
+
+        user_service.set_course_tag(self.user, self.course_id, 'other_key', 'other')
+        self.assertEqual(
+            user_service.get_course_tags(self.user.id, self.course_id),
+            {self.test_key: 'value', 'other_key': 'other'}
+        )
@@ -7,7 +7,9 @@ Stores global metadata using the UserPreference model, and per-course metadata u
 UserCourseTag model.
 """
 
-from user_api.models import UserCourseTag
+from django.core.cache import cache
+
+from user_api.models import UserCourseTag, COURSE_TAGS_CACHE_TIMEOUT
 
 # Scopes
 # (currently only allows per-course tags.  Can be expanded to support
@@ -28,15 +30,35 @@ def get_course_tag(user, course_id, key):
     Returns:
         string value, or None if there is no value saved
     """
-    try:
-        record = UserCourseTag.objects.get(
-            user=user,
-            course_id=course_id,
-            key=key)
-
-        return record.value
-    except UserCourseTag.DoesNotExist:
-        return None
+    return get_course_tags(user.id, course_id).get(key)
+
+
+def get_course_tags(user_id, course_id):
+    """
+    Gets all of the user's course tags in the specified course_id.
+
+    The tags are cached until one of them changes (for at most
+    COURSE_TAGS_CACHE_TIMEOUT seconds), as they're read on every course
+    request (see UserTagsEventContextMiddleware).
+
+    Args:
+        user_id: id of the User for the course tags
+        course_id: course identifier (string)
+
+    Returns:
+        dict of key -> value
+    """
+    cache_key = UserCourseTag.cache_key(user_id, course_id)
+    tags = cache.get(cache_key)
+    if tags is None:
+        tags = dict(
+            UserCourseTag.objects.filter(
+                user=user_id,
+                course_id=course_id
+            ).values_list('key', 'value')
+        )
+        cache.set(cache_key, tags, COURSE_TAGS_CACHE_TIMEOUT)
+    return tags
 
 
 def set_course_tag(user, course_id, key, value):
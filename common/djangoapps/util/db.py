@@ -0,0 +1,60 @@
+""" Utility functions related to database transactions """
+from contextlib import contextmanager
+import threading
+
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connection, transaction
+from django.dispatch import receiver
+
+# Cache keys to delete once the current request's transaction is committed
+_PENDING_CACHE_DELETES = threading.local()
+
+
+@contextmanager
+def all_or_nothing():
+    """
+    Roll back the writes made in the block if it raises.
+
+    This uses a savepoint, so it only applies within a transaction (as LMS
+    requests are, with TransactionMiddleware) on a database with savepoints:
+    otherwise each write is committed as it is made and can't be undone.
+    """
+    if not transaction.is_managed() or not connection.features.uses_savepoints:
+        yield
+        return
+
+    sid = transaction.savepoint()
+    try:
+        yield
+    except Exception:
+        transaction.savepoint_rollback(sid)
+        raise
+    transaction.savepoint_commit(sid)
+
+
+def delete_from_cache_on_commit(key):
+    """
+    Delete `key` from the cache now, and again once the current request has
+    finished, after TransactionMiddleware has committed its transaction.
+
+    Deleting it only now would let a concurrent request, which still reads the
+    data from before the transaction, cache that again.  Outside of a
+    transaction the writes are already committed, so deleting now is enough.
+    """
+    cache.delete(key)
+    if transaction.is_managed():
+        if not hasattr(_PENDING_CACHE_DELETES, 'keys'):
+            _PENDING_CACHE_DELETES.keys = set()
+        _PENDING_CACHE_DELETES.keys.add(key)
+
+
+@receiver(request_finished)
+def delete_pending_cache_keys(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Delete the keys passed to `delete_from_cache_on_commit` during the request
+    """
+    keys = getattr(_PENDING_CACHE_DELETES, 'keys', None)
+    if keys:
+        cache.delete_many(list(keys))
+        keys.clear()
@@ -0,0 +1,37 @@
+""" Tests for util.db """
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.test import TestCase
+from django.test.testcases import skipUnlessDBFeature
+
+from util.db import all_or_nothing, delete_from_cache_on_commit
+
+
+class AllOrNothingTest(TestCase):
+    """ Test all_or_nothing """
+    @skipUnlessDBFeature('uses_savepoints')
+    def test_rolls_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with all_or_nothing():
+                User.objects.create(username="rolled_back")
+                raise ValueError()
+        self.assertFalse(User.objects.filter(username="rolled_back").exists())
+
+    def test_keeps_writes(self):
+        with all_or_nothing():
+            User.objects.create(username="kept")
+        self.assertTrue(User.objects.filter(username="kept").exists())
+
+
+class DeleteFromCacheOnCommitTest(TestCase):
+    """ Test delete_from_cache_on_commit """
+    def test_deleted_again_when_request_finishes(self):
+        cache.set("key", "value")
+        delete_from_cache_on_commit("key")
+        self.assertIsNone(cache.get("key"))
+
+        # a concurrent request caches the data from before the commit
+        cache.set("key", "stale value")
+        request_finished.send(sender=None)
+        self.assertIsNone(cache.get("key"))
@@ -6,8 +6,10 @@ import datetime
 import json
 import logging
 import static_replace
+from collections import defaultdict
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.timezone import UTC
 from edxmako.shortcuts import render_to_string
 from xblock.exceptions import InvalidScopeError
@@ -20,6 +22,9 @@ from lms.lib.xblock.runtime import quote_slashes
 
 log = logging.getLogger(__name__)
 
+# Maximum number of modules whose grade histograms are computed in one query
+GRADE_HISTOGRAM_QUERY_CHUNK_SIZE = 500
+
 
 def wrap_fragment(fragment, new_content):
     """
@@ -134,22 +139,78 @@ def grade_histogram(module_id):
     it, their grade is None. Since there will always be at least one such student
     this function almost always returns [].
     '''
+    return grade_histograms([module_id])[module_id]
+
+
+def _grade_histogram_cache_key(module_id):
+    """
+    Returns the cache key for the grade histogram of `module_id`.
+    """
+    return u'grade_histogram.{0}'.format(module_id)
+
+
+def grade_histograms(module_ids):
+    '''
+    Returns a dict mapping each of `module_ids` to its grade histogram, as
+    computed by `grade_histogram`.
+
+    Histograms are cached for settings.GRADE_HISTOGRAM_CACHE_TIMEOUT seconds, and
+    the ones that aren't cached are computed with a single grouped query per chunk
+    of modules, so that prefetching all the problems in a unit costs one query.
+    '''
     from django.db import connection
-    cursor = connection.cursor()
 
-    q = """SELECT courseware_studentmodule.grade,
-                  COUNT(courseware_studentmodule.student_id)
-    FROM courseware_studentmodule
-    WHERE courseware_studentmodule.module_id=%s
-    GROUP BY courseware_studentmodule.grade"""
-    # Passing module_id this way prevents sql-injection.
-    cursor.execute(q, [module_id])
-
-    grades = list(cursor.fetchall())
-    grades.sort(key=lambda x: x[0])  # Add ORDER BY to sql query?
-    if len(grades) >= 1 and grades[0][0] is None:
-        return []
-    return grades
+    cache_keys = dict((module_id, _grade_histogram_cache_key(module_id)) for module_id in set(module_ids))
+    cached = cache.get_many(cache_keys.values())
+    histograms = dict(
+        (module_id, cached[cache_key]) for module_id, cache_key in cache_keys.items() if cache_key in cached
+    )
+    missing = [module_id for module_id in cache_keys if module_id not in histograms]
+
+    grades = defaultdict(list)
+    cursor = connection.cursor()
+    # Chunk the ids to stay below the limit on the number of query parameters in sqlite
+    for start in xrange(0, len(missing), GRADE_HISTOGRAM_QUERY_CHUNK_SIZE):
+        chunk = missing[start:start + GRADE_HISTOGRAM_QUERY_CHUNK_SIZE]
+        q = """SELECT courseware_studentmodule.module_id,
+                      courseware_studentmodule.grade,
+                      COUNT(courseware_studentmodule.student_id)
+        FROM courseware_studentmodule
+        WHERE courseware_studentmodule.module_id IN ({0})
+        GROUP BY courseware_studentmodule.module_id, courseware_studentmodule.grade""".format(
+            ', '.join(['%s'] * len(chunk))
+        )
+        # Passing module_ids this way prevents sql-injection.
+        cursor.execute(q, chunk)
+        for module_id, grade, count in cursor.fetchall():
+            grades[module_id].append((grade, count))
+
+    computed = {}
+    for module_id in missing:
+        histogram = sorted(grades[module_id], key=lambda x: x[0])  # Add ORDER BY to sql query?
+        if len(histogram) >= 1 and histogram[0][0] is None:
+            histogram = []
+        computed[cache_keys[module_id]] = histograms[module_id] = histogram
+
+    if computed:
+        cache.set_many(computed, getattr(settings, 'GRADE_HISTOGRAM_CACHE_TIMEOUT', 60))
+    return histograms
+
+
+def prefetch_grade_histograms(descriptor):
+    """
+    Computes and caches the grade histograms of all the scored descendants of
+    `descriptor` at once, so that rendering staff debug info for each of them
+    doesn't run a query per problem.
+    """
+    module_ids = []
+    descriptors = [descriptor]
+    while descriptors:
+        current = descriptors.pop()
+        if current.has_score:
+            module_ids.append(current.location.url())
+        descriptors.extend(current.get_children())
+    grade_histograms(module_ids)
 
 
 def add_staff_debug_info(user, block, view, frag, context):  # pylint: disable=unused-argument
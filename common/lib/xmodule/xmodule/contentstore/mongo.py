@@ -13,6 +13,10 @@ from xmodule.exceptions import NotFoundError
 from fs.osfs import OSFS
 import os
 import json
+from multiprocessing.pool import ThreadPool
+
+# The number of assets copied at once when exporting a course
+EXPORT_THREADS = 4
 
 
 class MongoContentStore(ContentStore):
@@ -57,6 +61,8 @@ class MongoContentStore(ContentStore):
             else:
                 fp.write(content.data)
 
+        # the upload date is only assigned when the file is closed
+        content.last_modified_at = fp.upload_date
         return content
 
     def delete(self, content_id):
@@ -104,18 +110,28 @@ class MongoContentStore(ContentStore):
             pass
 
     def export(self, location, output_directory):
-        content = self.find(location)
+        content = self.find(location, as_stream=True)
 
         if content.import_path is not None:
             output_directory = output_directory + '/' + os.path.dirname(content.import_path)
 
         if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
+            try:
+                os.makedirs(output_directory)
+            except OSError:
+                # another export thread may have just created it
+                if not os.path.isdir(output_directory):
+                    raise
 
         disk_fs = OSFS(output_directory)
 
-        with disk_fs.open(content.name, 'wb') as asset_file:
-            asset_file.write(content.data)
+        # copy the asset a chunk at a time rather than reading it all into memory
+        try:
+            with disk_fs.open(content.name, 'wb') as asset_file:
+                for chunk in content.stream_data():
+                    asset_file.write(chunk)
+        finally:
+            content.close()
 
     def export_all_for_course(self, course_location, output_directory, assets_policy_file):
         """
@@ -130,13 +146,23 @@ class MongoContentStore(ContentStore):
         policy = {}
         assets, __ = self.get_all_content_for_course(course_location)
 
+        asset_locations = []
         for asset in assets:
             asset_location = Location(asset['_id'])
-            self.export(asset_location, output_directory)
+            asset_locations.append(asset_location)
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize']:
                     policy.setdefault(asset_location.name, {})[attr] = value
 
+        # the copies are bound on reading from gridfs and writing to disk, so overlap them
+        if asset_locations:
+            pool = ThreadPool(min(EXPORT_THREADS, len(asset_locations)))
+            try:
+                pool.map(lambda location: self.export(location, output_directory), asset_locations)
+            finally:
+                pool.close()
+                pool.join()
+
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f)
 
@@ -1,3 +1,4 @@
+import copy
 import logging
 from cStringIO import StringIO
 from math import exp
@@ -625,7 +626,13 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
 
     @property
     def grader(self):
-        return grader_from_conf(self.raw_grader)
+        # building the grader from its configuration isn't free, and grading a course
+        # asks for it once per student, so keep it until the configuration changes
+        raw_grader = self.raw_grader
+        compiled = getattr(self, '_compiled_grader', None)
+        if compiled is None or compiled[0] != raw_grader:
+            compiled = self._compiled_grader = (copy.deepcopy(raw_grader), grader_from_conf(raw_grader))
+        return compiled[1]
 
     @property
     def raw_grader(self):
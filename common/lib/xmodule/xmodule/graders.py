@@ -1,4 +1,5 @@
 import abc
+import heapq
 import inspect
 import logging
 import random
@@ -289,19 +290,48 @@ class AssignmentFormatGrader(CourseGrader):
         self.show_only_average = show_only_average
         self.starting_index = starting_index
         self.hide_average = hide_average
+        # labels and details which don't depend on the student, by assignment index
+        self._short_labels = {}
+        self._unreleased_details = {}
+
+    def _short_label(self, index):
+        """
+        The short label of the assignment at index (counting from 0)
+        """
+        if index not in self._short_labels:
+            self._short_labels[index] = u"{short_label} {index:02d}".format(
+                index=index + self.starting_index,
+                short_label=self.short_label
+            )
+        return self._short_labels[index]
+
+    def _unreleased_detail(self, index):
+        """
+        The detail of the placeholder for the unreleased assignment at index (counting from 0)
+        """
+        if index not in self._unreleased_details:
+            self._unreleased_details[index] = u"{section_type} {index} Unreleased - 0% (?/?)".format(
+                index=index + self.starting_index,
+                section_type=self.section_type
+            )
+        return self._unreleased_details[index]
 
     def grade(self, grade_sheet, generate_random_scores=False):
         def total_with_drops(breakdown, drop_count):
             '''calculates total score for a section while dropping lowest scores'''
-            #create an array of tuples with (index, mark), sorted by mark['percent'] descending
-            sorted_breakdown = sorted(enumerate(breakdown), key=lambda x: -x[1]['percent'])
             # A list of the indices of the dropped scores
             dropped_indices = []
             if drop_count > 0:
-                dropped_indices = [x[0] for x in sorted_breakdown[-drop_count:]]
+                # the lowest scores, the later of any tied ones first (as a stable descending sort would put them)
+                dropped_indices = [
+                    index for index, __ in heapq.nsmallest(
+                        drop_count, enumerate(breakdown), key=lambda x: (x[1]['percent'], -x[0])
+                    )
+                ]
+            dropped = set(dropped_indices)
             aggregate_score = 0
             for index, mark in enumerate(breakdown):
-                if index not in dropped_indices:
+                if index not in dropped:
                     aggregate_score += mark['percent']
 
             if (len(breakdown) - drop_count > 0):
@@ -336,17 +366,9 @@ class AssignmentFormatGrader(CourseGrader):
                 )
             else:
                 percentage = 0
-                summary = u"{section_type} {index} Unreleased - 0% (?/?)".format(
-                    index=i + self.starting_index,
-                    section_type=self.section_type
-                )
-
-            short_label = u"{short_label} {index:02d}".format(
-                index=i + self.starting_index,
-                short_label=self.short_label
-            )
+                summary = self._unreleased_detail(i)
 
-            breakdown.append({'percent': percentage, 'label': short_label,
+            breakdown.append({'percent': percentage, 'label': self._short_label(i),
                               'detail': summary, 'category': self.category})
 
         total_percent, dropped_indices = total_with_drops(breakdown, self.drop_count)
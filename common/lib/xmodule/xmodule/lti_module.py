@@ -58,11 +58,43 @@ from xblock.fields import Boolean, Float
 
 log = logging.getLogger(__name__)
 
+# How long (in seconds) a course's LTI passports are kept in the system cache.
+# Passports changed in Studio take up to this long to reach LTI launches and callbacks.
+LTI_PASSPORTS_CACHE_TIMEOUT = 60
+
+# Parsed passports, keyed by the tuple of passport strings they were parsed from
+_PARSED_PASSPORTS = {}
+_PARSED_PASSPORTS_MAX_SIZE = 1000
+
 
 class LTIError(Exception):
     pass
 
 
+def parse_lti_passports(lti_passports):
+    """
+    Parses "id:key:secret" passport strings into a list of (id, key, secret)
+    tuples, in order, with None in place of any passport that can't be parsed.
+
+    The result is remembered for the same passports, so it's only worked out
+    once per process for each version of a course's passports.
+    """
+    lti_passports = tuple(lti_passports)
+    parsed = _PARSED_PASSPORTS.get(lti_passports)
+    if parsed is None:
+        parsed = []
+        for lti_passport in lti_passports:
+            try:
+                lti_id, key, secret = [i.strip() for i in lti_passport.split(':')]
+                parsed.append((lti_id, key, secret))
+            except ValueError:
+                parsed.append(None)
+        if len(_PARSED_PASSPORTS) >= _PARSED_PASSPORTS_MAX_SIZE:
+            _PARSED_PASSPORTS.clear()
+        _PARSED_PASSPORTS[lti_passports] = parsed
+    return parsed
+
+
 class LTIFields(object):
     """
     Fields to define and obtain LTI tool from provider are set here,
@@ -339,6 +371,21 @@ class LTIModule(LTIFields, XModule):
         course = self.descriptor.runtime.modulestore.get_item(course_location)
         return course
 
+    def get_lti_passports(self):
+        """
+        Return the LTI passports of the course.
+
+        Outcome callbacks from a tool arrive in bursts, so rather than loading the
+        course for every launch and callback, the passports are kept in the system
+        cache for LTI_PASSPORTS_CACHE_TIMEOUT seconds.
+        """
+        cache_key = u"lti_passports.{}".format(self.course_id)
+        lti_passports = self.system.cache.get(cache_key)
+        if lti_passports is None:
+            lti_passports = list(self.get_course().lti_passports)
+            self.system.cache.set(cache_key, lti_passports, LTI_PASSPORTS_CACHE_TIMEOUT)
+        return lti_passports
+
     @property
     def role(self):
         """
@@ -629,13 +676,12 @@ oauth_consumer_key="", oauth_signature="frVp4JuvT1mVXlxktiAUjQ7%2F1cw%3D"'}
         """
         Obtains client_key and client_secret credentials from current course.
         """
-        course = self.get_course()
-        for lti_passport in course.lti_passports:
-            try:
-                lti_id, key, secret = [i.strip() for i in lti_passport.split(':')]
-            except ValueError:
+        lti_passports = self.get_lti_passports()
+        for lti_passport, parsed in zip(lti_passports, parse_lti_passports(lti_passports)):
+            if parsed is None:
                 raise LTIError('Could not parse LTI passport: {0!r}. \
                     Should be "id:key:secret" string.'.format(lti_passport))
+            lti_id, key, secret = parsed
             if lti_id == self.lti_id.strip():
                 return key, secret
         return '', ''
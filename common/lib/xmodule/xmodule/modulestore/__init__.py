@@ -43,6 +43,12 @@ INVALID_HTML_CHARS = re.compile(r"[^\w-]", re.UNICODE)
 
 _LocationBase = namedtuple('LocationBase', 'tag org course category name revision')
 
+# Locations parsed from strings, keyed by (class, string type, string). Locations are
+# immutable, so the same instance is returned every time a string is parsed again.
+_PARSED_LOCATIONS = {}
+# The table is emptied when it grows past this many entries, to bound its memory
+PARSED_LOCATIONS_MAX_SIZE = 50000
+
 
 def _check_location_part(val, regexp):
     """
@@ -188,13 +194,23 @@ class Location(_LocationBase):
         if isinstance(location, Location):
             return location
         elif isinstance(location, basestring):
+            cache_key = (_cls, type(location), location)
+            parsed = _PARSED_LOCATIONS.get(cache_key)
+            if parsed is not None:
+                return parsed
+
             match = URL_RE.match(location)
             if match is None:
                 log.debug(u"location %r doesn't match URL", location)
                 raise InvalidLocationError(location)
             groups = match.groupdict()
             check_dict(groups)
-            return _LocationBase.__new__(_cls, **groups)
+            parsed = _LocationBase.__new__(_cls, **groups)
+
+            if len(_PARSED_LOCATIONS) >= PARSED_LOCATIONS_MAX_SIZE:
+                _PARSED_LOCATIONS.clear()
+            _PARSED_LOCATIONS[cache_key] = parsed
+            return parsed
         elif isinstance(location, (list, tuple)):
             if len(location) not in (5, 6):
                 log.debug(u'location has wrong length')
@@ -76,21 +76,39 @@ class DraftModuleStore(MongoModuleStore):
             get_children() to cache. None indicates to cache all descendents
         """
 
-        try:
-            return wrap_draft(super(DraftModuleStore, self).get_item(as_draft(location), depth=depth))
-        except ItemNotFoundError:
-            return wrap_draft(super(DraftModuleStore, self).get_item(location, depth=depth))
+        location = Location.ensure_fully_specified(location)
+        if location.revision is not None:
+            try:
+                return wrap_draft(super(DraftModuleStore, self).get_item(as_draft(location), depth=depth))
+            except ItemNotFoundError:
+                return wrap_draft(super(DraftModuleStore, self).get_item(location, depth=depth))
+
+        item = self._find_draft_or_published(location)
+        return wrap_draft(self._load_items([item], depth)[0])
 
     def get_instance(self, course_id, location, depth=0):
         """
         Get an instance of this location, with policy for course_id applied.
         TODO (vshnayder): this may want to live outside the modulestore eventually
         """
+        return self.get_item(location, depth=depth)
 
-        try:
-            return wrap_draft(super(DraftModuleStore, self).get_instance(course_id, as_draft(location), depth=depth))
-        except ItemNotFoundError:
-            return wrap_draft(super(DraftModuleStore, self).get_instance(course_id, location, depth=depth))
+    def _find_draft_or_published(self, location):
+        """
+        Returns the data for the draft of `location` if there is one, and for its
+        published version otherwise, querying for both revisions at once.
+
+        If neither exists, raises xmodule.modulestore.exceptions.ItemNotFoundError
+        """
+        query = location_to_query(as_published(location), wildcard=False)
+        query['_id.revision'] = {'$in': [DRAFT, None]}
+        items = list(self.collection.find(query))
+        if not items:
+            raise ItemNotFoundError(location)
+        for item in items:
+            if item['_id']['revision'] == DRAFT:
+                return item
+        return items[0]
 
     def create_xmodule(self, location, definition_data=None, metadata=None, system=None, fields={}):
         """
@@ -119,19 +137,41 @@ class DraftModuleStore(MongoModuleStore):
             in the request. The depth is counted in the number of calls to
             get_children() to cache. None indicates to cache all descendents
         """
-        draft_loc = as_draft(location)
-
-        draft_items = super(DraftModuleStore, self).get_items(draft_loc, course_id=course_id, depth=depth)
-        items = super(DraftModuleStore, self).get_items(location, course_id=course_id, depth=depth)
-
-        draft_locs_found = set(item.location.replace(revision=None) for item in draft_items)
+        location = Location(location)
+        if location.revision is not None:
+            draft_loc = as_draft(location)
+
+            draft_items = super(DraftModuleStore, self).get_items(draft_loc, course_id=course_id, depth=depth)
+            items = super(DraftModuleStore, self).get_items(location, course_id=course_id, depth=depth)
+
+            draft_locs_found = set(item.location.replace(revision=None) for item in draft_items)
+            non_draft_items = [
+                item
+                for item in items
+                if (item.location.revision != DRAFT
+                    and item.location.replace(revision=None) not in draft_locs_found)
+            ]
+            return [wrap_draft(item) for item in draft_items + non_draft_items]
+
+        # Query for both revisions at once, and only load the published items
+        # that don't have a draft
+        query = location_to_query(location)
+        query['_id.revision'] = {'$in': [DRAFT, None]}
+        draft_items = []
+        non_draft_items = []
+        for item in self.collection.find(query, sort=[('revision', pymongo.ASCENDING)]):
+            if item['_id']['revision'] == DRAFT:
+                draft_items.append(item)
+            else:
+                non_draft_items.append(item)
+
+        draft_locs_found = set(Location(item['_id']).replace(revision=None) for item in draft_items)
         non_draft_items = [
             item
-            for item in items
-            if (item.location.revision != DRAFT
-                and item.location.replace(revision=None) not in draft_locs_found)
+            for item in non_draft_items
+            if Location(item['_id']) not in draft_locs_found
         ]
-        return [wrap_draft(item) for item in draft_items + non_draft_items]
+        return [wrap_draft(item) for item in self._load_items(draft_items + non_draft_items, depth)]
 
     def convert_to_draft(self, source_location):
         """
@@ -200,27 +240,78 @@ class DraftModuleStore(MongoModuleStore):
         """
         Save a current draft to the underlying modulestore
         """
+        self._publish_items([self.get_item(location)], published_by_id)
+
+    def publish_subtree(self, location, published_by_id):
+        """
+        Save the current drafts of the item at location and of all its descendants to the underlying
+        modulestore, as publish does for each of them
+        """
+        root = self.get_item(location, depth=None)
+        items = []
+        to_visit = [root]
+        while to_visit:
+            item = to_visit.pop()
+            items.append(item)
+            if item.has_children:
+                to_visit.extend(reversed(item.get_children()))
+        self._publish_items(items, published_by_id)
+
+    def _publish_items(self, items, published_by_id):
+        """
+        Publish the given (already loaded) items, diffing each against its published version to
+        delete removed children, and refreshing the metadata inheritance tree once at the end
+        """
+        if not items:
+            return
+
+        published_locations = [as_published(item.location) for item in items]
+        draft_locations = [as_draft(item.location) for item in items]
+        # one query for which items have drafts and what the published versions' children are
+        original_children = {}
+        for result in self.collection.find(
+            {'_id': {'$in': [namedtuple_to_son(loc) for loc in published_locations + draft_locations]}},
+            {'definition.children': True}
+        ):
+            result_loc = Location(result['_id'])
+            if result_loc.revision is None:
+                original_children[result_loc] = result.get('definition', {}).get('children', [])
+
+        course_location = published_locations[0]
+        pseudo_course_id = '/'.join([course_location.org, course_location.course])
+        # don't recompute the inheritance tree for every write; it's refreshed once below
+        suspend_refresh = pseudo_course_id not in self.ignore_write_events_on_courses
+        if suspend_refresh:
+            self.ignore_write_events_on_courses.append(pseudo_course_id)
         try:
-            original_published = super(DraftModuleStore, self).get_item(location)
-        except ItemNotFoundError:
-            original_published = None
-
-        draft = self.get_item(location)
-
-        draft.published_date = datetime.now(UTC)
-        draft.published_by = published_by_id
-        if draft.has_children:
-            if original_published is not None:
-                # see if children were deleted. 2 reasons for children lists to differ:
-                #   1) child deleted
-                #   2) child moved
-                for child in original_published.children:
-                    if child not in draft.children:
-                        rents = [Location(mom) for mom in self.get_parent_locations(child, None)]
-                        if (len(rents) == 1 and rents[0] == Location(location)):  # the 1 is this original_published
-                            self.delete_item(child, True)
-        super(DraftModuleStore, self).update_item(draft, '**replace_user**')
-        self.delete_item(location)
+            now = datetime.now(UTC)
+            for item, published_location in zip(items, published_locations):
+                item.published_date = now
+                item.published_by = published_by_id
+                if item.has_children and published_location in original_children:
+                    # see if children were deleted. 2 reasons for children lists to differ:
+                    #   1) child deleted
+                    #   2) child moved
+                    for child in original_children[published_location]:
+                        if child not in item.children:
+                            rents = [Location(mom) for mom in self.get_parent_locations(child, None)]
+                            if (len(rents) == 1 and rents[0] == published_location):  # the 1 is this original_published
+                                self.delete_item(child, True)
+                super(DraftModuleStore, self).update_item(item, '**replace_user**')
+
+            # Must include this to avoid the django debug toolbar (which defines the deprecated "safe=False")
+            # from overriding our default value set in the init method.
+            self.collection.remove(
+                {'_id': {'$in': [namedtuple_to_son(loc) for loc in draft_locations]}},
+                safe=self.collection.safe
+            )
+            for draft_location in draft_locations:
+                self.fire_updated_modulestore_signal(get_course_id_no_run(draft_location), draft_location)
+        finally:
+            if suspend_refresh:
+                self.ignore_write_events_on_courses.remove(pseudo_course_id)
+            # refresh even if a publish failed, as the items already written have changed
+            self.refresh_cached_metadata_inheritance_tree(course_location)
 
     def unpublish(self, location):
         """
@@ -230,18 +321,25 @@ class DraftModuleStore(MongoModuleStore):
         super(DraftModuleStore, self).delete_item(location)
 
     def _query_children_for_cache_children(self, items):
-        # first get non-draft in a round-trip
-        to_process_non_drafts = super(DraftModuleStore, self)._query_children_for_cache_children(items)
-
-        to_process_dict = {}
-        for non_draft in to_process_non_drafts:
-            to_process_dict[Location(non_draft["_id"])] = non_draft
-
-        # now query all draft content in another round-trip
+        # get non-draft and draft content in a single round-trip
+        locations = [Location(item) for item in items]
         query = {
-            '_id': {'$in': [namedtuple_to_son(as_draft(Location(item))) for item in items]}
+            '_id': {'$in': (
+                [namedtuple_to_son(location) for location in locations] +
+                [namedtuple_to_son(as_draft(location)) for location in locations]
+            )}
         }
-        to_process_drafts = list(self.collection.find(query))
+        requested = set(locations)
+        to_process_drafts = []
+        to_process_dict = {}
+        for result in self.collection.find(query):
+            result_loc = Location(result["_id"])
+            if result_loc in requested:
+                to_process_dict[result_loc] = result
+            if result_loc.revision == DRAFT:
+                # a draft may also have been requested itself, and each entry
+                # has to be its own dict as _cache_children modifies them
+                to_process_drafts.append(dict(result))
 
         # now we have to go through all drafts and replace the non-draft
         # with the draft. This is because the semantics of the DraftStore is to
@@ -23,6 +23,13 @@ URL_RE_SOURCE = r"""
 
 URL_RE = re.compile('^' + URL_RE_SOURCE + '$', re.IGNORECASE | re.VERBOSE | re.UNICODE)
 
+# Results of matching URL_RE, keyed by (string type, string), so that locators
+# built from the same url don't repeat the match
+_PARSED_URLS = {}
+# The table is emptied when it grows past this many entries, to bound its memory
+PARSED_URLS_MAX_SIZE = 50000
+_NO_MATCH = object()
+
 
 def parse_url(string, tag_optional=False):
     """
@@ -46,13 +53,20 @@ def parse_url(string, tag_optional=False):
     with key 'id' and optional keys 'branch' and 'version_guid'.
 
     """
-    match = URL_RE.match(string)
-    if not match:
+    matched_dict = _PARSED_URLS.get((type(string), string), _NO_MATCH)
+    if matched_dict is _NO_MATCH:
+        match = URL_RE.match(string)
+        matched_dict = match.groupdict() if match else None
+        if len(_PARSED_URLS) >= PARSED_URLS_MAX_SIZE:
+            _PARSED_URLS.clear()
+        _PARSED_URLS[(type(string), string)] = matched_dict
+
+    if not matched_dict:
         return None
-    matched_dict = match.groupdict()
     if matched_dict['tag'] is None and not tag_optional:
         return None
-    return matched_dict
+    # Callers get their own copy, so the cached parse can't be modified
+    return dict(matched_dict)
 
 
 BLOCK_RE = re.compile(r'^' + ALLOWED_ID_CHARS + r'+$', re.IGNORECASE | re.UNICODE)
@@ -1154,9 +1154,10 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         # iterate over subtree list filtering out blacklist.
         orphans = set()
         destination_blocks = destination_structure['blocks']
+        source_parents = self._get_parent_map(source_structure)
         for subtree_root in subtree_list:
             # find the parents and put root in the right sequence
-            parents = self._get_parents_from_structure(subtree_root, source_structure)
+            parents = source_parents.get(subtree_root, [])
             if not all(parent in destination_blocks for parent in parents):
                 raise ItemNotFoundError(parents)
             for parent_loc in parents:
@@ -1173,9 +1174,10 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                 )
             )
         # remove any remaining orphans
+        destination_parents = self._get_parent_map(destination_structure)
         for orphan in orphans:
             # orphans will include moved as well as deleted xblocks. Only delete the deleted ones.
-            self._delete_if_true_orphan(orphan, destination_structure)
+            self._delete_if_true_orphan(orphan, destination_structure, destination_parents)
 
         # update the db
         self.db_connection.insert_structure(destination_structure)
@@ -1524,6 +1526,17 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
 
         return items
 
+    def _get_parent_map(self, structure):
+        """
+        Given a structure, map each block_id to the list of its parents in that structure. Note the parents
+        are in the encoded format (as from _get_parents_from_structure)
+        """
+        parents = {}
+        for parent_id, value in structure['blocks'].iteritems():
+            for child_id in value['fields'].get('children', []):
+                parents.setdefault(child_id, []).append(parent_id)
+        return parents
+
     def _sync_children(self, source_parent, destination_parent, new_child):
         """
         Reorder destination's children to the same as source's and remove any no longer in source.
@@ -1589,14 +1602,17 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         fields['children'] = [child for child in fields.get('children', []) if child not in blacklist]
         return fields
 
-    def _delete_if_true_orphan(self, orphan, structure):
+    def _delete_if_true_orphan(self, orphan, structure, parent_map):
         """
         Delete the orphan and any of its descendants which no longer have parents.
+
+        :param parent_map: the structure's _get_parent_map, which this keeps up to date as it deletes
         """
-        if not self._get_parents_from_structure(orphan, structure):
-            encoded_block_id = LocMapperStore.encode_key_for_mongo(orphan)
+        encoded_block_id = LocMapperStore.encode_key_for_mongo(orphan)
+        if encoded_block_id in structure['blocks'] and not parent_map.get(orphan):
             for child in structure['blocks'][encoded_block_id]['fields'].get('children', []):
-                self._delete_if_true_orphan(child, structure)
+                parent_map[child].remove(encoded_block_id)
+                self._delete_if_true_orphan(child, structure, parent_map)
             del structure['blocks'][encoded_block_id]
 
     def _new_block(self, user_id, category, block_fields, definition_id, new_id):
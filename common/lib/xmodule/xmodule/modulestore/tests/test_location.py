@@ -125,6 +125,19 @@ class TestLocations(TestCase):
         with self.assertRaises(InvalidLocationError):
             Location(loc)
 
+    def test_parsed_string_interned(self):
+        url = "tag://org/course/category/interned_name"
+        self.assertIs(Location(url), Location(url))
+        # unicode and byte strings are parsed separately, so component types are preserved
+        self.assertEquals(Location(url), Location(unicode(url)))
+        self.assertIsInstance(Location(unicode(url)).name, unicode)
+
+    def test_invalid_string_not_interned(self):
+        url = "tag://org/course/category/name with spaces"
+        for _ in range(2):
+            with self.assertRaises(InvalidLocationError):
+                Location(url)
+
     def test_equality(self):
         self.assertEquals(
             Location('tag', 'org', 'course', 'category', 'name'),
@@ -187,3 +187,81 @@ class TestPublish(unittest.TestCase):
             self.draft_mongo.get_item(location)
         self.assertNotIn(other_child_loc.url(), item.children)
         self.assertTrue(self.draft_mongo.has_item(None, other_child_loc), "Oops, lost moved item")
+
+    def test_draft_resolution_single_query(self):
+        """
+        Draft-or-published resolution fetches both revisions with one query, preferring the draft.
+        """
+        self._create_course()
+        location = self.course_location.replace(category='vertical', name='Vert1')
+        self.draft_mongo.publish(location, random.getrandbits(32))
+        self.draft_mongo.convert_to_draft(location)
+        published_only = self.course_location.replace(category='vertical', name='Vert2')
+        self.draft_mongo.publish(published_only, random.getrandbits(32))
+
+        def item_queries(mock_find):
+            """
+            The number of queries for items (rather than for the metadata inheritance tree)
+            """
+            return len([call for call in mock_find.call_args_list if '_id.revision' in call[0][0]])
+
+        with mock.patch.object(
+            self.draft_mongo.collection, 'find', wraps=self.draft_mongo.collection.find
+        ) as mock_find:
+            item = self.draft_mongo.get_item(location)
+            self.assertTrue(item.is_draft)
+            self.assertEqual(item.location, location)
+            self.assertEqual(item_queries(mock_find), 1)
+
+            mock_find.reset_mock()
+            item = self.draft_mongo.get_item(published_only)
+            self.assertFalse(item.is_draft)
+            self.assertEqual(item_queries(mock_find), 1)
+
+            mock_find.reset_mock()
+            items = self.draft_mongo.get_items(self.course_location.replace(category='vertical', name=None))
+            self.assertEqual(item_queries(mock_find), 1)
+        self.assertEqual(
+            sorted((item.location.name, item.is_draft) for item in items),
+            [('Vert1', True), ('Vert2', False)]
+        )
+
+    def test_publish_subtree(self):
+        """
+        Publishing a subtree publishes every item under it, as publishing each of them does, and
+        recomputes inheritance once.
+        """
+        self._create_course()
+        userid = random.getrandbits(32)
+        chapter_location = self.course_location.replace(category='chapter', name='Chapter1')
+        self.draft_mongo.modulestore_update_signal = mock.Mock()
+        # published_by and published_date are only fields with the cms mixin, so record them as written
+        published = {}
+        update_item = MongoModuleStore.update_item
+
+        def record_update(store, xblock, user=None, allow_not_found=False):
+            published[xblock.location.replace(revision=None)] = (xblock.published_by, xblock.published_date)
+            update_item(store, xblock, user, allow_not_found)
+
+        with mock.patch.object(MongoModuleStore, 'update_item', record_update):
+            with mock.patch.object(
+                self.draft_mongo, 'refresh_cached_metadata_inheritance_tree',
+                wraps=self.draft_mongo.refresh_cached_metadata_inheritance_tree
+            ) as mock_refresh:
+                self.draft_mongo.publish_subtree(chapter_location, userid)
+        self.assertEqual(mock_refresh.call_count, 1)
+
+        signalled = [call[1]['location'] for call in self.draft_mongo.modulestore_update_signal.send.call_args_list]
+        for category, name in [
+                ('chapter', 'Chapter1'), ('vertical', 'Vert1'), ('vertical', 'Vert2'), ('html', 'Html1'),
+                ('html', 'Html2'), ('discussion', 'Discussion1'), ('discussion', 'Discussion2'),
+        ]:
+            location = self.course_location.replace(category=category, name=name)
+            self.assertFalse(getattr(self.draft_mongo.get_item(location), 'is_draft', False))
+            self.assertTrue(self.old_mongo.has_item(None, location))
+            # the items which are never drafts are stamped as published too
+            published_by, published_date = published[location]
+            self.assertEqual(published_by, userid)
+            self.assertIsNotNone(published_date)
+            # the removal of each draft is signalled
+            self.assertIn(location.replace(revision='draft'), signalled)
@@ -1220,6 +1220,25 @@ class TestPublish(SplitModuleTest):
         expected = ["head12345", "chapter1", "chapter3", "problem1"]
         self._check_course(source_course, dest_course, expected, ["chapter2", "problem3_2"])
 
+    def test_delete_orphan_subtree(self):
+        """
+        Test publishing the removal of a block deletes its descendants which no longer have parents.
+        """
+        source_course = CourseLocator(package_id="GreekHero", branch='draft')
+        dest_course = CourseLocator(package_id="GreekHero", branch="published")
+        # give problem1 a second parent so that it survives the removal of chapter3
+        chapter1 = modulestore().get_item(self._usage(source_course, "chapter1"))
+        chapter1.children.append("problem1")
+        modulestore().update_item(chapter1, self.user)
+        modulestore().xblock_publish(self.user, source_course, dest_course, ["head12345"], ["chapter2"])
+        expected = ["head12345", "chapter1", "chapter3", "problem1", "problem3_2"]
+        self._check_course(source_course, dest_course, expected, ["chapter2"])
+        # remove chapter3 but not its children from the draft
+        modulestore().delete_item(self._usage(source_course, "chapter3"), self.user)
+        modulestore().xblock_publish(self.user, source_course, dest_course, ["head12345"], ["chapter2"])
+        expected = ["head12345", "chapter1", "problem1"]
+        self._check_course(source_course, dest_course, expected, ["chapter2", "chapter3", "problem3_2"])
+
     def _check_course(self, source_course_loc, dest_course_loc, expected_blocks, unexpected_blocks):
         """
         Check that the course has the expected blocks and does not have the unexpected blocks
@@ -59,7 +59,8 @@ def export_to_xml(modulestore, contentstore, course_location, root_dir, course_d
     """
 
     course_id = course_location.course_id
-    course = modulestore.get_course(course_id)
+    # load the whole course tree up front so that serializing it doesn't query the modulestore per block
+    course = modulestore.get_item(course_location, depth=None)
 
     fs = OSFS(root_dir)
     export_fs = course.runtime.export_fs = fs.makeopendir(course_dir)
@@ -110,18 +111,45 @@ def export_to_xml(modulestore, contentstore, course_location, root_dir, course_d
                                                        'vertical', None, 'draft'])
         if len(draft_verticals) > 0:
             draft_course_dir = export_fs.makeopendir(DRAFT_DIR)
+            # the published tree is already loaded, so find the parents of the drafts from it
+            # rather than asking the modulestore for each one
+            parents = _child_parent_map(course)
             for draft_vertical in draft_verticals:
-                parent_locs = draft_modulestore.get_parent_locations(draft_vertical.location, course.location.course_id)
-                # Don't try to export orphaned items.
-                if len(parent_locs) > 0:
+                vertical_url = draft_vertical.location.url()
+                if vertical_url in parents:
+                    parent_url, index = parents[vertical_url]
+                else:
+                    parent_locs = draft_modulestore.get_parent_locations(draft_vertical.location, course.location.course_id)
+                    # Don't try to export orphaned items.
+                    if len(parent_locs) == 0:
+                        continue
                     logging.debug('parent_locs = {0}'.format(parent_locs))
-                    draft_vertical.xml_attributes['parent_sequential_url'] = Location(parent_locs[0]).url()
+                    parent_url = Location(parent_locs[0]).url()
                     sequential = modulestore.get_item(Location(parent_locs[0]))
-                    index = sequential.children.index(draft_vertical.location.url())
-                    draft_vertical.xml_attributes['index_in_children_list'] = str(index)
-                    draft_vertical.runtime.export_fs = draft_course_dir
-                    node = lxml.etree.Element('unknown')
-                    draft_vertical.add_xml_to_node(node)
+                    index = sequential.children.index(vertical_url)
+                draft_vertical.xml_attributes['parent_sequential_url'] = parent_url
+                draft_vertical.xml_attributes['index_in_children_list'] = str(index)
+                draft_vertical.runtime.export_fs = draft_course_dir
+                node = lxml.etree.Element('unknown')
+                draft_vertical.add_xml_to_node(node)
+
+
+def _child_parent_map(course):
+    """
+    Map the url of every block in the loaded `course` tree to the url of its parent and its index
+    in the parent's children
+    """
+    parents = {}
+    to_visit = [course]
+    while to_visit:
+        item = to_visit.pop()
+        if not item.has_children:
+            continue
+        parent_url = item.location.url()
+        for index, child_url in enumerate(item.children):
+            parents[child_url] = (parent_url, index)
+        to_visit.extend(item.get_children())
+    return parents
 
 
 def _export_field_content(xblock_item, item_dir):
@@ -5,6 +5,16 @@ from .grading_service_module import GradingService, GradingServiceError
 
 log = logging.getLogger(__name__)
 
+# How long (in seconds) a student's peer grading progress for a location is kept in the system cache
+DATA_FOR_LOCATION_CACHE_TIMEOUT = 60
+
+
+def data_for_location_cache_key(problem_location, student_id):
+    """
+    The key a student's peer grading progress for a location is cached under.
+    """
+    return u"peer_grading.data_for_location.{0}.{1}".format(problem_location, student_id)
+
 
 class PeerGradingService(GradingService):
     """
@@ -31,6 +41,24 @@ class PeerGradingService(GradingService):
         response = self.get(self.get_data_for_location_url, params)
         return self.try_to_decode(response)
 
+    def get_cached_data_for_location(self, problem_location, student_id):
+        """
+        Get a student's peer grading progress for a location, as get_data_for_location does.
+
+        Successful answers are kept in the system cache for
+        DATA_FOR_LOCATION_CACHE_TIMEOUT seconds, so reading the same student's
+        progress again soon after (e.g. rendering then scoring the module)
+        doesn't ask the controller again.  This doesn't fetch many students at
+        once: the controller has no endpoint for that.
+        """
+        cache_key = data_for_location_cache_key(problem_location, student_id)
+        response = self.system.cache.get(cache_key)
+        if response is None:
+            response = self.get_data_for_location(problem_location, student_id)
+            if isinstance(response, dict) and response.get('success'):
+                self.system.cache.set(cache_key, response, DATA_FOR_LOCATION_CACHE_TIMEOUT)
+        return response
+
     def get_next_submission(self, problem_location, grader_id):
         response = self.get(
             self.get_next_submission_url,
@@ -44,7 +72,10 @@ class PeerGradingService(GradingService):
     def save_grade(self, **kwargs):
         data = kwargs
         data.update({'rubric_scores_complete': True})
-        return self.try_to_decode(self.post(self.save_grade_url, data))
+        response = self.try_to_decode(self.post(self.save_grade_url, data))
+        # the grader's progress has changed, so their cached progress is stale
+        self.system.cache.delete(data_for_location_cache_key(data['location'], data['grader_id']))
+        return response
 
     def is_student_calibrated(self, problem_location, grader_id):
         params = {'problem_id': problem_location, 'student_id': grader_id}
@@ -121,3 +152,6 @@ class MockPeerGradingService(object):
 
     def get_data_for_location(self, problem_location, student_id):
         return {"version": 1, "count_graded": 3, "count_required": 3, "success": True, "student_sub_count": 1, 'submissions_available' : 0}
+
+    def get_cached_data_for_location(self, problem_location, student_id):
+        return self.get_data_for_location(problem_location, student_id)
@@ -224,7 +224,7 @@ class PeerGradingModule(PeerGradingFields, XModule):
         response = {}
 
         try:
-            response = self.peer_gs.get_data_for_location(location, student_id)
+            response = self.peer_gs.get_cached_data_for_location(location, student_id)
             count_graded = response['count_graded']
             count_required = response['count_required']
             success = True
@@ -529,6 +529,35 @@ class PeerGradingModule(PeerGradingFields, XModule):
             log.error("Cannot find a path to problem {0} in this course.".format(location))
             raise
 
+    def _find_corresponding_modules_for_locations(self, locations):
+        """
+        Find the modules that exist at the given locations.  Returns a dict of
+        location url -> module for the locations that were found.
+
+        Rather than loading the locations one at a time, all the modules of each
+        of their categories are fetched from the modulestore in one go.
+        """
+        found = {}
+        modulestore = getattr(self.descriptor.system, 'modulestore', None)
+        if modulestore is not None:
+            wanted = set(location.url() for location in locations)
+            categories = set((location.tag, location.org, location.course, location.category) for location in locations)
+            for tag, org, course, category in categories:
+                for item in modulestore.get_items(Location(tag, org, course, category, None)):
+                    url = item.location.replace(revision=None).url()
+                    if url in wanted:
+                        # keep the first item for a location, should a store return
+                        # more than one (e.g. a draft and its published version)
+                        found.setdefault(url, item)
+
+        for location in locations:
+            if location.url() not in found:
+                try:
+                    found[location.url()] = self._find_corresponding_module_for_location(location)
+                except (NoPathToItem, ItemNotFoundError):
+                    continue
+        return found
+
     def peer_grading(self, _data=None):
         '''
         Show a peer grading interface
@@ -562,13 +591,14 @@ class PeerGradingModule(PeerGradingFields, XModule):
             log.exception("Could not contact peer grading service.")
             success = False
 
+        problem_locations = [Location(problem['location']) for problem in problem_list]
+        descriptors = self._find_corresponding_modules_for_locations(problem_locations)
+
         good_problem_list = []
-        for problem in problem_list:
-            problem_location = Location(problem['location'])
-            try:
-                descriptor = self._find_corresponding_module_for_location(problem_location)
-            except (NoPathToItem, ItemNotFoundError):
+        for problem, problem_location in zip(problem_list, problem_locations):
+            if problem_location.url() not in descriptors:
                 continue
+            descriptor = descriptors[problem_location.url()]
             if descriptor:
                 problem['due'] = get_extended_due_date(descriptor)
                 grace_period = descriptor.graceperiod
@@ -111,6 +111,24 @@ class GraderTest(unittest.TestCase):
         self.assertAlmostEqual(graded['percent'], 0.9226190476190477)
         self.assertEqual(len(graded['section_breakdown']), 7 + 1)
 
+    def test_assignment_format_grader_drops_later_ties(self):
+        grader = graders.AssignmentFormatGrader("Homework", 4, 2)
+        gradesheet = {
+            'Homework': [Score(earned=1, possible=2.0, graded=True, section='hw1'),
+                         Score(earned=1, possible=1.0, graded=True, section='hw2'),
+                         Score(earned=1, possible=2.0, graded=True, section='hw3'),
+                         Score(earned=1, possible=2.0, graded=True, section='hw4')],
+        }
+        graded = grader.grade(gradesheet)
+        self.assertAlmostEqual(graded['percent'], 0.75)
+        # of the tied lowest scores, the later ones are dropped
+        self.assertEqual(
+            [index for index, section in enumerate(graded['section_breakdown']) if 'mark' in section],
+            [2, 3]
+        )
+        # repeated grading (which reuses the labels) gives the same result
+        self.assertEqual(grader.grade(gradesheet), graded)
+
     def test_assignment_format_grader_on_single_section_entry(self):
         midterm_grader = graders.AssignmentFormatGrader("Midterm", 1, 0)
         # Test the grading on a section with one item:
@@ -305,6 +305,26 @@ class LTIModuleTest(LogicTest):
         expected = ('','')
         self.assertEqual(expected, key_secret)
 
+    @patch('xmodule.course_module.CourseDescriptor.id_to_location')
+    def test_client_key_secret_cached(self, test):
+        """
+        LTI module loads the course only once while its passports are in the system cache.
+        """
+        cached = {}
+        self.xmodule.system.cache = Mock(
+            get=cached.get,
+            set=lambda key, value, timeout=None: cached.__setitem__(key, value)
+        )
+        mocked_course = Mock(lti_passports = ['lti_id:test_client:test_secret'])
+        modulestore = Mock()
+        modulestore.get_item.return_value = mocked_course
+        runtime = Mock(modulestore=modulestore)
+        self.xmodule.descriptor.runtime = runtime
+        self.xmodule.lti_id = "lti_id"
+        for __ in range(3):
+            self.assertEqual(('test_client', 'test_secret'), self.xmodule.get_client_key_secret())
+        self.assertEqual(modulestore.get_item.call_count, 1)
+
     @patch('xmodule.course_module.CourseDescriptor.id_to_location')
     def test_bad_client_key_secret(self, test):
         """
@@ -10,7 +10,8 @@ from xblock.fields import ScopeIds
 from xmodule.modulestore import Location
 from xmodule.tests import get_test_system, get_test_descriptor_system
 from xmodule.tests.test_util_open_ended import DummyModulestore
-from xmodule.open_ended_grading_classes.peer_grading_service import MockPeerGradingService
+from xmodule.open_ended_grading_classes.peer_grading_service import PeerGradingService, MockPeerGradingService
+from xmodule.open_ended_grading_classes.grading_service_module import GradingServiceError
 from xmodule.peer_grading_module import PeerGradingModule, PeerGradingDescriptor, MAX_ALLOWED_FEEDBACK_LENGTH
 from xmodule.modulestore.exceptions import ItemNotFoundError, NoPathToItem
 
@@ -159,6 +160,36 @@ class PeerGradingModuleTest(unittest.TestCase, DummyModulestore):
         """
         self.peer_grading.get_instance_state()
 
+    def test_save_grade_required_done(self):
+        """
+        Test that saving the grade which completes the required grading reports it done,
+        even though the student's progress was cached before.
+        """
+        cached = {}
+        self.peer_grading.system.cache = Mock(
+            get=cached.get,
+            set=lambda key, value, timeout=None: cached.__setitem__(key, value),
+            delete=lambda key: cached.pop(key, None),
+        )
+        config = {'url': 'http://controller', 'peer_grading': '/peer_grading', 'username': 'u', 'password': 'p'}
+        peer_gs = PeerGradingService(config, self.peer_grading.system)
+        progress = {'success': True, 'count_graded': 2, 'count_required': 3}
+
+        def save_grade(url, data):
+            """The controller counts the saved grade."""
+            progress['count_graded'] += 1
+            return json.dumps({'success': True})
+
+        with patch.object(peer_gs, 'get_data_for_location', side_effect=lambda loc, student_id: dict(progress)):
+            with patch.object(peer_gs, 'post', side_effect=save_grade):
+                self.peer_grading.peer_gs = peer_gs
+                success, data = self.peer_grading.query_data_for_location("blah")
+                self.assertTrue(success)
+                self.assertEqual(data['count_graded'], 2)
+
+                response = self.peer_grading.save_grade(self.save_dict)
+                self.assertTrue(response['required_done'])
+
     def test_save_grade_with_long_feedback(self):
         """
         Test if feedback is too long save_grade() should return error message.
@@ -281,6 +312,28 @@ class PeerGradingModuleScoredTest(unittest.TestCase, DummyModulestore):
         html = peer_grading.peer_grading()
         self.assertIn("Peer-Graded", html)
 
+    def test_problem_list_fetched_by_category(self):
+        """
+        Test that the problems in the list are fetched from the modulestore together.
+        """
+        peer_grading = self.get_module_from_location(self.problem_location, COURSE)
+        peer_grading.peer_gs = MockPeerGradingServiceProblemList()
+        problem = self.get_module_from_location(
+            Location("i4x://edX/open_ended/combinedopenended/SampleQuestion"), COURSE
+        )
+        modulestore = Mock()
+        modulestore.get_items.return_value = [problem]
+
+        with patch.object(peer_grading.descriptor.system, 'modulestore', modulestore, create=True):
+            with patch.object(PeerGradingModule, '_find_corresponding_module_for_location') as mock_find:
+                html = peer_grading.peer_grading()
+
+        self.assertIn("Peer-Graded", html)
+        self.assertFalse(mock_find.called)
+        modulestore.get_items.assert_called_once_with(
+            Location(["i4x", "edX", "open_ended", "combinedopenended", None])
+        )
+
 
 class PeerGradingModuleLinkedTest(unittest.TestCase, DummyModulestore):
     """
@@ -454,3 +507,36 @@ class PeerGradingModuleLinkedTest(unittest.TestCase, DummyModulestore):
 
         data = peer_grading.handle_ajax('get_next_submission', {'location': self.coe_location})
         self.assertEqual(json.loads(data)['submission_id'], 1)
+
+
+class PeerGradingServiceTest(unittest.TestCase):
+    """
+    Test the peer grading service client without a grading controller.
+    """
+    def setUp(self):
+        cached = {}
+        system = Mock(cache=Mock(
+            get=cached.get,
+            set=lambda key, value, timeout=None: cached.__setitem__(key, value)
+        ))
+        config = {'url': 'http://controller', 'peer_grading': '/peer_grading', 'username': 'u', 'password': 'p'}
+        self.service = PeerGradingService(config, system)
+
+    def test_get_cached_data_for_location(self):
+        """
+        Successful answers are cached, failures are asked about again.
+        """
+        data = MockPeerGradingService().get_data_for_location(None, None)
+
+        def get_data_for_location(problem_location, student_id):
+            if student_id == 'failing':
+                raise GradingServiceError()
+            return data
+
+        with patch.object(self.service, 'get_data_for_location', side_effect=get_data_for_location) as mock_get:
+            for __ in range(2):
+                for student_id in ('one', 'two'):
+                    self.assertEqual(self.service.get_cached_data_for_location('location', student_id), data)
+                with self.assertRaises(GradingServiceError):
+                    self.service.get_cached_data_for_location('location', 'failing')
+            self.assertEqual(mock_get.call_count, 4)
@@ -1239,3 +1239,6 @@ class DoNothingCache(object):
 
     def set(self, key, value, timeout=None):
         pass
+
+    def delete(self, key):
+        pass
@@ -12,6 +12,9 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+from string import Formatter
+
 from django.db import models, transaction
 from django.contrib.auth.models import User
 from html_to_text import html_to_text
@@ -137,6 +140,85 @@ class Optout(models.Model):
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
 
+# Context keys whose values change from one recipient to the next.
+RECIPIENT_CONTEXT_KEYS = ('name', 'email')
+
+
+class CompiledEmailTemplate(object):
+    """
+    An email template with everything but the per-recipient fields already rendered.
+
+    The template is parsed once, and every field that does not depend on the
+    recipient is formatted with the provided `context`.  The message body is
+    inserted in place of the first body tag, exactly as `CourseEmailTemplate._render`
+    would do.  Calls to `render` then only format the fields named in `recipient_keys`
+    and join the precomputed pieces.
+    """
+    def __init__(self, format_string, message_body, context, recipient_keys=RECIPIENT_CONTEXT_KEYS):
+        self.format_string = format_string
+        self.message_body = message_body
+        self.context = dict(context)
+        self.recipient_keys = frozenset(recipient_keys)
+
+        # Each part is either a rendered unicode string, or the source text of a
+        # field (e.g. u'{name}') that is rendered for each recipient.
+        parts = []
+        literal = []
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(format_string):
+            literal.append(literal_text)
+            if field_name is None:
+                continue
+            field_text = u'{' + field_name
+            if conversion:
+                field_text += u'!' + conversion
+            if format_spec:
+                field_text += u':' + format_spec
+            field_text += u'}'
+            if re.split(r'[.\[]', field_name, 1)[0] in self.recipient_keys:
+                parts.append(u''.join(literal))
+                parts.append(_RecipientField(field_text))
+                literal = []
+            else:
+                literal.append(field_text.format(**self.context))
+        parts.append(u''.join(literal))
+
+        # Insert the message body after the substitutions have been performed,
+        # as in CourseEmailTemplate._render.
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        for index, part in enumerate(parts):
+            if not isinstance(part, _RecipientField) and message_body_tag in part:
+                parts[index] = part.replace(message_body_tag, message_body, 1)
+                break
+        self._parts = parts
+
+    def render(self, recipient_context):
+        """
+        Create a message for one recipient.
+
+        `recipient_context` provides the values for the recipient fields.  Output is
+        identical to rendering the full template with the combined context.
+        """
+        context = dict(self.context)
+        context.update(recipient_context)
+        pieces = []
+        for part in self._parts:
+            if isinstance(part, _RecipientField):
+                value = part.format(**context)
+                if u'{' in value or u'}' in value:
+                    # A recipient value could itself contain (part of) the message body tag,
+                    # so fall back to rendering the whole template to preserve its placement.
+                    return CourseEmailTemplate._render(self.format_string, self.message_body, context)
+                pieces.append(value)
+            else:
+                pieces.append(part)
+        return u''.join(pieces)
+
+
+class _RecipientField(unicode):
+    """Marks the source text of a template field that is rendered per recipient."""
+    pass
+
+
 class CourseEmailTemplate(models.Model):
     """
     Stores templates for all emails to a course to use.
@@ -195,6 +277,24 @@ class CourseEmailTemplate(models.Model):
         # finally, return the result, without converting to an encoded byte array.
         return result
 
+    def compile_plaintext(self, plaintext, context, recipient_keys=RECIPIENT_CONTEXT_KEYS):
+        """
+        Create a CompiledEmailTemplate for the plain text message.
+
+        Everything in the stored plain template except the fields named in
+        `recipient_keys` is rendered once using the provided `context` dict.
+        """
+        return CompiledEmailTemplate(self.plain_template, plaintext, context, recipient_keys)
+
+    def compile_htmltext(self, htmltext, context, recipient_keys=RECIPIENT_CONTEXT_KEYS):
+        """
+        Create a CompiledEmailTemplate for the HTML message.
+
+        Everything in the stored HTML template except the fields named in
+        `recipient_keys` is rendered once using the provided `context` dict.
+        """
+        return CompiledEmailTemplate(self.html_template, htmltext, context, recipient_keys)
+
     def render_plaintext(self, plaintext, context):
         """
         Create plain text message.
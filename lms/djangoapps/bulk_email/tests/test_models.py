@@ -103,6 +103,31 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_matches_render(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        plaintext = template.compile_plaintext("My new plain text.", context)
+        htmltext = template.compile_htmltext("My new html text.", context)
+        for name, email in [(u'Robot', u'robot@edx.org'), (u'{{message_body}}', u'{weird}@edx.org')]:
+            context.update({'name': name, 'email': email})
+            self.assertEquals(
+                plaintext.render(context),
+                template.render_plaintext("My new plain text.", context)
+            )
+            self.assertEquals(
+                htmltext.render(context),
+                template.render_htmltext("My new html text.", context)
+            )
+
+    def test_compile_without_context(self):
+        template = CourseEmailTemplate.get_template()
+        base_context = self._get_sample_html_context()
+        for keyname in base_context:
+            context = dict(base_context)
+            del context[keyname]
+            with self.assertRaises(KeyError):
+                template.compile_htmltext("My new html text.", context).render(context)
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
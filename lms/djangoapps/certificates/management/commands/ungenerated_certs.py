@@ -1,12 +1,11 @@
 from django.core.management.base import BaseCommand
-from certificates.models import certificate_status_for_student
 from certificates.queue import XQueueCertInterface
 from django.contrib.auth.models import User
 from optparse import make_option
 from django.conf import settings
 from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore.django import modulestore
-from certificates.models import CertificateStatuses
+from certificates.models import CertificateStatuses, GeneratedCertificate
 import datetime
 from pytz import UTC
 
@@ -48,6 +47,13 @@ class Command(BaseCommand):
                     'whose entry in the certificate table matches STATUS. '
                     'STATUS can be generating, unavailable, deleted, error '
                     'or notpassing.'),
+        make_option('--chunk-size',
+                    metavar='SIZE',
+                    dest='chunk_size',
+                    type='int',
+                    default=100,
+                    help='Number of students whose certificates are '
+                    'requested together'),
     )
 
     def handle(self, *args, **options):
@@ -90,28 +96,39 @@ class Command(BaseCommand):
             xq = XQueueCertInterface()
             if options['insecure']:
                 xq.use_https = False
-            total = enrolled_students.count()
+            enrolled_students = list(enrolled_students)
+            total = len(enrolled_students)
             count = 0
+            last_status_count = 0
             start = datetime.datetime.now(UTC)
 
-            for student in enrolled_students:
-                count += 1
-                if count % STATUS_INTERVAL == 0:
+            chunk_size = options['chunk_size']
+            for chunk_start in xrange(0, total, chunk_size):
+                chunk = enrolled_students[chunk_start:chunk_start + chunk_size]
+                if count - last_status_count >= STATUS_INTERVAL:
                     # Print a status update with an approximation of
                     # how much time is left based on how long the last
                     # interval took
                     diff = datetime.datetime.now(UTC) - start
-                    timeleft = diff * (total - count) / STATUS_INTERVAL
+                    timeleft = diff * (total - count) / (count - last_status_count)
                     hours, remainder = divmod(timeleft.seconds, 3600)
                     minutes, seconds = divmod(remainder, 60)
                     print "{0}/{1} completed ~{2:02}:{3:02}m remaining".format(
                         count, total, hours, minutes)
                     start = datetime.datetime.now(UTC)
-
-                if certificate_status_for_student(
-                        student, course_id)['status'] in valid_statuses:
-                    if not options['noop']:
-                        # Add the certificate request to the queue
-                        ret = xq.add_cert(student, course_id, course=course)
-                        if ret == 'generating':
-                            print '{0} - {1}'.format(student, ret)
+                    last_status_count = count
+                count += len(chunk)
+
+                # students without a certificate are unavailable
+                cert_statuses = dict(GeneratedCertificate.objects.filter(
+                    user__in=chunk, course_id=course_id).values_list('user_id', 'status'))
+                students = [
+                    student for student in chunk
+                    if cert_statuses.get(student.id, CertificateStatuses.unavailable) in valid_statuses
+                ]
+                if students and not options['noop']:
+                    # Add the certificate requests to the queue
+                    new_statuses = xq.add_certs(students, course_id, course=course)
+                    for student in students:
+                        if new_statuses[student.id] == 'generating':
+                            print '{0} - {1}'.format(student, new_statuses[student.id])
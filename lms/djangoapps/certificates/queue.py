@@ -1,5 +1,4 @@
 from certificates.models import GeneratedCertificate
-from certificates.models import certificate_status_for_student
 from certificates.models import CertificateStatuses as status
 from certificates.models import CertificateWhitelist
 
@@ -8,6 +7,7 @@ from django.test.client import RequestFactory
 from capa.xqueue_interface import XQueueInterface
 from capa.xqueue_interface import make_xheader, make_hashkey
 from django.conf import settings
+from django.db import transaction
 from requests.auth import HTTPBasicAuth
 from student.models import UserProfile, CourseEnrollment
 from verify_student.models import SoftwareSecurePhotoVerification
@@ -74,8 +74,6 @@ class XQueueCertInterface(object):
             settings.XQUEUE_INTERFACE['django_auth'],
             requests_auth,
         )
-        self.whitelist = CertificateWhitelist.objects.all()
-        self.restricted = UserProfile.objects.filter(allow_certificate=False)
         self.use_https = True
 
     def regen_cert(self, student, course_id, course=None):
@@ -148,6 +146,27 @@ class XQueueCertInterface(object):
 
         Returns the student's status
 
+        """
+        return self.add_certs([student], course_id, course)[student.id]
+
+    def add_certs(self, students, course_id, course=None):
+        """
+
+        Arguments:
+          students - iterable of User.object
+          course_id - courseenrollment.course_id (string)
+
+        Request new certificates for many students at once, as
+        add_cert would for each of them.  The profiles, whitelist
+        entries, enrollment modes, verification status and existing
+        certificates of all the students are fetched together, new
+        certificates are created in bulk and the queue requests are
+        sent once the certificates have been saved.  Nothing is saved
+        until all the students have been graded, so a student who
+        can't be graded leaves no certificate "generating" unqueued.
+
+        Returns a dict of student id -> the student's status
+
         """
 
         VALID_STATUSES = [status.generating,
@@ -156,31 +175,56 @@ class XQueueCertInterface(object):
                           status.error,
                           status.notpassing]
 
-        cert_status = certificate_status_for_student(student, course_id)['status']
-
-        new_status = cert_status
-
-        if cert_status in VALID_STATUSES:
-            # grade the student
+        students = list(students)
+        certs = dict(
+            (cert.user_id, cert)
+            for cert in GeneratedCertificate.objects.filter(user__in=students, course_id=course_id)
+        )
 
-            # re-use the course passed in optionally so we don't have to re-fetch everything
-            # for every student
-            if course is None:
-                course = courses.get_course_by_id(course_id)
-            profile = UserProfile.objects.get(user=student)
+        new_statuses = {}
+        to_grade = []
+        for student in students:
+            cert = certs.get(student.id)
+            new_statuses[student.id] = cert.status if cert is not None else status.unavailable
+            if new_statuses[student.id] in VALID_STATUSES:
+                to_grade.append(student)
+        if not to_grade:
+            return new_statuses
+
+        # re-use the course passed in optionally so we don't have to re-fetch everything
+        # for every student
+        if course is None:
+            course = courses.get_course_by_id(course_id)
+
+        user_ids = [student.id for student in to_grade]
+        profiles = dict(
+            (profile.user_id, profile) for profile in UserProfile.objects.filter(user__in=user_ids)
+        )
+        whitelisted = set(CertificateWhitelist.objects.filter(
+            user__in=user_ids, course_id=course_id, whitelist=True).values_list('user_id', flat=True))
+        enrollment_modes = dict(CourseEnrollment.objects.filter(
+            user__in=user_ids, course_id=course_id, is_active=True).values_list('user_id', 'mode'))
+        verified = SoftwareSecurePhotoVerification.verified_user_ids(user_ids)
+        reverified = SoftwareSecurePhotoVerification.reverified_for_all_user_ids(course_id, user_ids)
+        course_id_dict = Location.parse_course_id(course_id)
+
+        new_certs = []
+        changed_certs = []
+        queue_requests = []
+        for student in to_grade:
+            profile = profiles.get(student.id)
+            if profile is None:
+                raise UserProfile.DoesNotExist(u"No profile for user {}".format(student.username))
 
             # Needed
             self.request.user = student
             self.request.session = {}
 
             grade = grades.grade(student, self.request, course)
-            is_whitelisted = self.whitelist.filter(
-                user=student, course_id=course_id, whitelist=True).exists()
-            enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+            enrollment_mode = enrollment_modes.get(student.id)
             mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
-            user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
-            user_is_reverified = SoftwareSecurePhotoVerification.user_is_reverified_for_all(course_id, student)
-            course_id_dict = Location.parse_course_id(course_id)
+            user_is_verified = student.id in verified
+            user_is_reverified = student.id in reverified
             cert_mode = enrollment_mode
             if (mode_is_verified and user_is_verified and user_is_reverified):
                 template_pdf = "certificate-template-{org}-{course}-verified.pdf".format(**course_id_dict)
@@ -191,7 +235,12 @@ class XQueueCertInterface(object):
                 # honor code and audit students
                 template_pdf = "certificate-template-{org}-{course}.pdf".format(**course_id_dict)
 
-            cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+            cert = certs.get(student.id)
+            if cert is None:
+                cert = GeneratedCertificate(user=student, course_id=course_id)
+                new_certs.append(cert)
+            else:
+                changed_certs.append(cert)
 
             cert.mode = cert_mode
             cert.user = student
@@ -199,17 +248,15 @@ class XQueueCertInterface(object):
             cert.course_id = course_id
             cert.name = profile.name
 
-            if is_whitelisted or grade['grade'] is not None:
+            if student.id in whitelisted or grade['grade'] is not None:
 
                 # check to see whether the student is on the
                 # the embargoed country restricted list
                 # otherwise, put a new certificate request
                 # on the queue
 
-                if self.restricted.filter(user=student).exists():
-                    new_status = status.restricted
-                    cert.status = new_status
-                    cert.save()
+                if not profile.allow_certificate:
+                    cert.status = status.restricted
                 else:
                     key = make_hashkey(random.random())
                     cert.key = key
@@ -221,16 +268,26 @@ class XQueueCertInterface(object):
                         'grade': grade['grade'],
                         'template_pdf': template_pdf,
                     }
-                    new_status = status.generating
-                    cert.status = new_status
-                    cert.save()
-                    self._send_to_xqueue(contents, key)
+                    cert.status = status.generating
+                    queue_requests.append((contents, key))
             else:
-                new_status = status.notpassing
-                cert.status = new_status
+                cert.status = status.notpassing
+
+            new_statuses[student.id] = cert.status
+
+        # save all the certificates or none of them, so that none is left
+        # generating without its request on the queue
+        with transaction.commit_on_success():
+            if new_certs:
+                GeneratedCertificate.objects.bulk_create(new_certs)
+            for cert in changed_certs:
                 cert.save()
 
-        return new_status
+        # the certificates must be saved before the queue calls back with them
+        for contents, key in queue_requests:
+            self._send_to_xqueue(contents, key)
+
+        return new_statuses
 
     def _send_to_xqueue(self, contents, key):
 
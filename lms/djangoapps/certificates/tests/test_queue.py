@@ -0,0 +1,133 @@
+"""
+Tests for requesting certificates from the queue.
+"""
+from django.core.management import call_command
+from django.test import TestCase
+from mock import Mock, patch
+
+from certificates.models import CertificateStatuses, CertificateWhitelist, GeneratedCertificate
+from certificates.queue import XQueueCertInterface
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+
+COURSE_ID = 'edX/toy/2012_Fall'
+
+
+class AddCertsTest(TestCase):
+    """
+    Test requesting certificates for many students at once.
+    """
+    def setUp(self):
+        self.course = Mock(id=COURSE_ID)
+        self.passing = UserFactory.create()
+        self.notpassing = UserFactory.create()
+        self.whitelisted = UserFactory.create()
+        self.restricted = UserFactory.create(profile__allow_certificate=False)
+        self.verified = UserFactory.create()
+        self.unverified = UserFactory.create()
+        self.students = [
+            self.passing, self.notpassing, self.whitelisted,
+            self.restricted, self.verified, self.unverified,
+        ]
+        for student in self.students:
+            mode = 'verified' if student in (self.verified, self.unverified) else 'honor'
+            CourseEnrollmentFactory.create(user=student, course_id=COURSE_ID, mode=mode)
+        CertificateWhitelist.objects.create(user=self.whitelisted, course_id=COURSE_ID, whitelist=True)
+
+        # an existing certificate to request again
+        GeneratedCertificate.objects.create(user=self.passing, course_id=COURSE_ID, status=CertificateStatuses.error)
+
+        self.xq = XQueueCertInterface()
+        self.xq.xqueue_interface = Mock()
+        self.xq.xqueue_interface.send_to_queue.return_value = (0, "queued")
+
+        def grade(student, request, course):  # pylint: disable=unused-argument
+            """Everybody passes but the notpassing and whitelisted students."""
+            if student in (self.notpassing, self.whitelisted):
+                return {'grade': None, 'percent': 0.1}
+            return {'grade': 'Pass', 'percent': 0.9}
+
+        patchers = [
+            patch('certificates.queue.grades.grade', side_effect=grade),
+            patch(
+                'certificates.queue.SoftwareSecurePhotoVerification.verified_user_ids',
+                return_value=set([self.verified.id]),
+            ),
+            patch(
+                'certificates.queue.SoftwareSecurePhotoVerification.reverified_for_all_user_ids',
+                return_value=set([self.verified.id, self.unverified.id]),
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def certificates(self):
+        """The students' certificates, as user id -> (status, mode, grade, name)."""
+        return dict(
+            (cert.user_id, (cert.status, cert.mode, cert.grade, cert.name))
+            for cert in GeneratedCertificate.objects.filter(course_id=COURSE_ID)
+        )
+
+    def test_add_certs(self):
+        statuses = self.xq.add_certs(self.students, COURSE_ID, course=self.course)
+
+        self.assertEqual(statuses, {
+            self.passing.id: CertificateStatuses.generating,
+            self.notpassing.id: CertificateStatuses.notpassing,
+            self.whitelisted.id: CertificateStatuses.generating,
+            self.restricted.id: CertificateStatuses.restricted,
+            self.verified.id: CertificateStatuses.generating,
+            self.unverified.id: CertificateStatuses.generating,
+        })
+        certificates = self.certificates()
+        self.assertEqual(certificates[self.verified.id][1], GeneratedCertificate.MODES.verified)
+        self.assertEqual(certificates[self.unverified.id][1], GeneratedCertificate.MODES.honor)
+        self.assertEqual(self.xq.xqueue_interface.send_to_queue.call_count, 4)
+
+    def test_add_certs_matches_add_cert(self):
+        batched_statuses = self.xq.add_certs(self.students, COURSE_ID, course=self.course)
+        batched = self.certificates()
+
+        GeneratedCertificate.objects.all().delete()
+        GeneratedCertificate.objects.create(user=self.passing, course_id=COURSE_ID, status=CertificateStatuses.error)
+        statuses = dict(
+            (student.id, self.xq.add_cert(student, COURSE_ID, course=self.course))
+            for student in self.students
+        )
+
+        self.assertEqual(batched_statuses, statuses)
+        self.assertEqual(batched, self.certificates())
+
+    def test_nothing_queued_if_saving_fails(self):
+        with patch.object(GeneratedCertificate.objects, 'bulk_create', side_effect=Exception):
+            with self.assertRaises(Exception):
+                self.xq.add_certs(self.students, COURSE_ID, course=self.course)
+
+        self.assertFalse(self.xq.xqueue_interface.send_to_queue.called)
+        self.assertEqual(
+            GeneratedCertificate.objects.get(user=self.passing, course_id=COURSE_ID).status,
+            CertificateStatuses.error
+        )
+
+
+class UngeneratedCertsTest(TestCase):
+    """
+    Test the ungenerated_certs management command.
+    """
+    def test_chunks(self):
+        students = [UserFactory.create(username='student{}'.format(i)) for i in range(5)]
+        for student in students:
+            CourseEnrollmentFactory.create(user=student, course_id=COURSE_ID)
+
+        def add_certs(chunk, course_id, course=None):  # pylint: disable=unused-argument
+            """Leave the certificates unrequested."""
+            return dict((student.id, CertificateStatuses.unavailable) for student in chunk)
+
+        with patch('certificates.management.commands.ungenerated_certs.modulestore'):
+            with patch.object(XQueueCertInterface, 'add_certs', side_effect=add_certs) as mock_add_certs:
+                call_command('ungenerated_certs', course=COURSE_ID, chunk_size=2)
+
+        self.assertEqual(
+            [list(call[0][0]) for call in mock_add_certs.call_args_list],
+            [students[0:2], students[2:4], students[4:5]]
+        )
@@ -194,30 +194,45 @@ def _grade(student, request, course, keep_raw_scores):
                 descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
             )
 
+            # Fetch the student's state for the whole section at once, both to see whether
+            # it needs grading and so that scoring it doesn't query per problem
+            with manual_transaction():
+                section_student_modules = list(StudentModule.objects.filter(
+                    student=student,
+                    module_state_key__in=[
+                        descriptor.location for descriptor in section['xmoduledescriptors']
+                    ]
+                ))
+
             # If we haven't seen a single problem in the section, we don't have to grade it at all! We can assume 0%
             if not should_grade_section:
-                with manual_transaction():
-                    should_grade_section = StudentModule.objects.filter(
-                        student=student,
-                        module_state_key__in=[
-                            descriptor.location for descriptor in section['xmoduledescriptors']
-                        ]
-                    ).exists()
+                should_grade_section = len(section_student_modules) > 0
 
             if should_grade_section:
                 scores = []
+                student_modules = dict.fromkeys(
+                    descriptor.location.url() for descriptor in section['xmoduledescriptors']
+                )
+                student_modules.update(
+                    (student_module.module_state_key, student_module)
+                    for student_module in section_student_modules
+                    if student_module.course_id == course.id
+                )
+                section_field_data_cache = _SectionFieldDataCache(course.id, student, section_descriptor)
 
-                def create_module(descriptor):
+                def create_module(descriptor, section_field_data_cache=section_field_data_cache):
                     '''creates an XModule instance given a descriptor'''
+                    with manual_transaction():
+                        field_data_cache = section_field_data_cache.for_descriptor(descriptor)
                     # TODO: We need the request to pass into here. If we could forego that, our arguments
                     # would be simpler
-                    with manual_transaction():
-                        field_data_cache = FieldDataCache([descriptor], course.id, student)
                     return get_module_for_descriptor(student, request, descriptor, field_data_cache, course.id)
 
                 for module_descriptor in yield_dynamic_descriptor_descendents(section_descriptor, create_module):
 
-                    (correct, total) = get_score(course.id, student, module_descriptor, create_module)
+                    (correct, total) = get_score(
+                        course.id, student, module_descriptor, create_module, student_modules=student_modules
+                    )
                     if correct is None and total is None:
                         continue
 
@@ -264,6 +279,33 @@ def _grade(student, request, course, keep_raw_scores):
     return grade_summary
 
 
+class _SectionFieldDataCache(object):
+    """
+    The FieldDataCache shared by the modules of a section when grading it.  It is
+    only built once a module is needed (usually none are, the scores being stored).
+    """
+    def __init__(self, course_id, student, section_descriptor):
+        self.course_id = course_id
+        self.student = student
+        self.section_descriptor = section_descriptor
+        self.field_data_cache = None
+        self.cached_locations = None
+
+    def for_descriptor(self, descriptor):
+        """
+        Returns a FieldDataCache holding the student's state for `descriptor`.
+        """
+        if self.field_data_cache is None:
+            self.field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+                self.course_id, self.student, self.section_descriptor
+            )
+            self.cached_locations = set(cached.location for cached in self.field_data_cache.descriptors)
+        if descriptor.location not in self.cached_locations:
+            # e.g. dynamic children, which aren't in the section's cache
+            return FieldDataCache([descriptor], self.course_id, self.student)
+        return self.field_data_cache
+
+
 def grade_for_percentage(grade_cutoffs, percentage):
     """
     Returns a letter grade as defined in grading_policy (e.g. 'A' 'B' 'C' for 6.002x) or None.
@@ -383,7 +425,7 @@ def _progress_summary(student, request, course):
 
     return chapters
 
-def get_score(course_id, user, problem_descriptor, module_creator):
+def get_score(course_id, user, problem_descriptor, module_creator, student_modules=None):
     """
     Return the score for a user on a problem, as a tuple (correct, total).
     e.g. (5,7) if you got 5 out of 7 points.
@@ -395,7 +437,8 @@ def get_score(course_id, user, problem_descriptor, module_creator):
     problem_descriptor: an XModuleDescriptor
     module_creator: a function that takes a descriptor, and returns the corresponding XModule for this user.
            Can return None if user doesn't have access, or if something else went wrong.
-    cache: A FieldDataCache
+    student_modules: an optional dict of the user's StudentModules in the course, already fetched, keyed
+           by location url. None marks a location which has been looked up and has no StudentModule.
     """
     if not user.is_authenticated():
         return (None, None)
@@ -416,14 +459,18 @@ def get_score(course_id, user, problem_descriptor, module_creator):
         # These are not problems, and do not have a score
         return (None, None)
 
-    try:
-        student_module = StudentModule.objects.get(
-            student=user,
-            course_id=course_id,
-            module_state_key=problem_descriptor.location
-        )
-    except StudentModule.DoesNotExist:
-        student_module = None
+    location_url = problem_descriptor.location.url()
+    if student_modules is not None and location_url in student_modules:
+        student_module = student_modules[location_url]
+    else:
+        try:
+            student_module = StudentModule.objects.get(
+                student=user,
+                course_id=course_id,
+                module_state_key=problem_descriptor.location
+            )
+        except StudentModule.DoesNotExist:
+            student_module = None
 
     if student_module is not None and student_module.max_grade is not None:
         correct = student_module.grade if student_module.grade is not None else 0
@@ -4,7 +4,8 @@ When we added XBlock storage, each field modification wrote a new history row
 to the db.  Now that we have bulk saves to avoid that database hammering, we
 need to clean out the unnecessary rows from the database.
 
-This command that does that.
+This command that does that.  It can also apply a retention policy, keeping
+only the most recent rows, or the rows newer than some age, of each module.
 
 """
 
@@ -15,6 +16,8 @@ import optparse
 import time
 import traceback
 
+from pytz import UTC
+
 from django.core.management.base import NoArgsCommand
 from django.db import connection
 
@@ -43,6 +46,18 @@ class Command(NoArgsCommand):
             default=0,
             help="Seconds to sleep between batches.",
         ),
+        optparse.make_option(
+            '--keep-count',
+            type='int',
+            default=None,
+            help="Retention policy: keep only this many of the latest rows for each module.",
+        ),
+        optparse.make_option(
+            '--keep-days',
+            type='float',
+            default=None,
+            help="Retention policy: keep only rows newer than this many days (and each module's latest row).",
+        ),
     )
 
     def handle_noargs(self, **options):
@@ -51,6 +66,8 @@ class Command(NoArgsCommand):
 
         smhc = StudentModuleHistoryCleaner(
             dry_run=options["dry_run"],
+            keep_count=options["keep_count"],
+            keep_days=options["keep_days"],
         )
         smhc.main(batch_size=options["batch"], sleep=options["sleep"])
 
@@ -61,11 +78,16 @@ class StudentModuleHistoryCleaner(object):
     DELETE_GAP_SECS = 0.5   # Rows this close can be discarded.
     STATE_FILE = "clean_history.json"
     BATCH_SIZE = 100
+    DELETE_BATCH_SIZE = 1000    # Most rows to delete in one statement.
 
-    def __init__(self, dry_run=False):
+    def __init__(self, dry_run=False, keep_count=None, keep_days=None):
         self.dry_run = dry_run
+        self.keep_count = keep_count
+        self.keep_days = keep_days
         self.next_student_module_id = 0
         self.last_student_module_id = 0
+        # History rows read ahead for a batch of student modules, see prefetch_history.
+        self.prefetched_history = {}
 
     def main(self, batch_size=None, sleep=0):
         """Invoked from the management command to do all the work."""
@@ -78,12 +100,17 @@ class StudentModuleHistoryCleaner(object):
         self.load_state()
 
         while self.next_student_module_id <= self.last_student_module_id:
+            self.prefetch_history(
+                self.next_student_module_id,
+                min(self.next_student_module_id + batch_size - 1, self.last_student_module_id),
+            )
             for smid in self.module_ids_to_check(batch_size):
                 try:
                     self.clean_one_student_module(smid)
                 except Exception:       # pylint: disable=W0703
                     trace = traceback.format_exc()
                     self.say("Couldn't clean student_module_id {}:\n{}".format(smid, trace))
+            self.prefetched_history = {}
             if not self.dry_run:
                 self.commit()
             self.save_state()
@@ -166,6 +193,28 @@ class StudentModuleHistoryCleaner(object):
             yield smid
             self.next_student_module_id = smid+1
 
+    def prefetch_history(self, first_student_module_id, last_student_module_id):
+        """
+        Read the history rows for a range of student modules with one query.
+
+        The rows are kept for `get_history_for_student_modules`, so that
+        cleaning each module in the range doesn't need a query of its own.
+
+        """
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT id, created, student_module_id FROM courseware_studentmodulehistory
+            WHERE student_module_id BETWEEN %s AND %s
+            ORDER BY student_module_id, created, id
+            """,
+            [first_student_module_id, last_student_module_id]
+        )
+        self.prefetched_history = dict(
+            (smid, []) for smid in range(first_student_module_id, last_student_module_id + 1)
+        )
+        for history_id, created, student_module_id in cursor.fetchall():
+            self.prefetched_history[student_module_id].append((history_id, created))
+
     def get_history_for_student_modules(self, student_module_id):
         """
         Get the history rows for a student module.
@@ -176,6 +225,9 @@ class StudentModuleHistoryCleaner(object):
         Return a list: [(id, created), ...], all the rows of history.
 
         """
+        if student_module_id in self.prefetched_history:
+            return self.prefetched_history.pop(student_module_id)
+
         cursor = connection.cursor()
         cursor.execute("""
             SELECT id, created FROM courseware_studentmodulehistory
@@ -193,14 +245,47 @@ class StudentModuleHistoryCleaner(object):
 
         ```ids_to_delete```: a non-empty list (or set...) of history row ids to delete.
 
+        The rows are deleted at most `DELETE_BATCH_SIZE` at a time, to keep
+        each statement short.
+
         """
         assert ids_to_delete
+        ids_to_delete = list(ids_to_delete)
         cursor = connection.cursor()
-        cursor.execute("""
-            DELETE FROM courseware_studentmodulehistory
-            WHERE id IN ({ids})
-            """.format(ids=",".join(str(i) for i in ids_to_delete))
-        )
+        for start in range(0, len(ids_to_delete), self.DELETE_BATCH_SIZE):
+            cursor.execute("""
+                DELETE FROM courseware_studentmodulehistory
+                WHERE id IN ({ids})
+                """.format(ids=",".join(str(i) for i in ids_to_delete[start:start + self.DELETE_BATCH_SIZE]))
+            )
+
+    def ids_past_retention(self, history, ids_to_delete):
+        """
+        Find the history rows the retention policy discards.
+
+        ```history```: all the rows of history for a student module, as
+        [(id, created), ...], oldest first.
+
+        ```ids_to_delete```: the ids of rows already being deleted.
+
+        Return a list of the ids of the other rows to delete.  The latest row
+        is always kept.
+
+        """
+        ids_to_delete = set(ids_to_delete)
+        remaining = [row for row in history if row[0] not in ids_to_delete]
+        to_discard = set()
+        if self.keep_count is not None:
+            to_discard.update(history_id for history_id, _ in remaining[:max(len(remaining) - self.keep_count, 0)])
+        if self.keep_days is not None:
+            cutoff = datetime.datetime.now(UTC) - datetime.timedelta(days=self.keep_days)
+            for history_id, created in remaining:
+                if created.tzinfo is None:
+                    created = created.replace(tzinfo=UTC)
+                if created < cutoff:
+                    to_discard.add(history_id)
+        to_discard.discard(remaining[-1][0])
+        return [history_id for history_id, _ in reversed(remaining) if history_id in to_discard]
 
     def clean_one_student_module(self, student_module_id):
         """Clean one StudentModule's-worth of history.
@@ -227,6 +312,9 @@ class StudentModuleHistoryCleaner(object):
 
             next_created = created
 
+        if self.keep_count is not None or self.keep_days is not None:
+            ids_to_delete.extend(self.ids_past_retention(history, ids_to_delete))
+
         verb = "Would have deleted" if self.dry_run else "Deleting"
         self.say("{verb} {to_delete} rows of {total} for student_module_id {id}".format(
             verb=verb,
@@ -207,6 +207,31 @@ class HistoryCleanerNoDbTest(HistoryCleanerTest):
         self.assert_said(smhc, "Deleting 4 rows of 8 for student_module_id 17")
         smhc.delete_history.assert_called_once_with([42, 23, 15, 8])
 
+    def test_keep_count(self):
+        smhc = SmhcDbMocked(keep_count=2)
+        smhc.set_rows([
+            (4, "2013-07-13 16:30:00.000"),
+            (8, "2013-07-13 16:30:01.100"),
+            (15, "2013-07-13 16:30:01.200"),
+            (16, "2013-07-13 16:30:01.300"),
+            (98, "2013-07-13 16:30:02.600"),    # keep
+            (99, "2013-07-13 16:30:59.000"),    # keep
+        ])
+        smhc.clean_one_student_module(17)
+        self.assert_said(smhc, "Deleting 4 rows of 6 for student_module_id 17")
+        smhc.delete_history.assert_called_once_with([15, 8, 16, 4])
+
+    def test_keep_days_keeps_latest(self):
+        smhc = SmhcDbMocked(keep_days=30)
+        smhc.set_rows([
+            (4, "2013-07-13 16:30:00.000"),
+            (16, "2013-07-13 16:30:01.300"),
+            (99, "2013-07-13 16:30:59.000"),    # keep
+        ])
+        smhc.clean_one_student_module(17)
+        self.assert_said(smhc, "Deleting 2 rows of 3 for student_module_id 17")
+        smhc.delete_history.assert_called_once_with([16, 4])
+
 
 class HistoryCleanerWitDbTest(HistoryCleanerTest):
     """Tests of StudentModuleHistoryCleaner with a real db."""
@@ -340,6 +365,57 @@ class HistoryCleanerWitDbTest(HistoryCleanerTest):
             (50, "2013-07-13 16:30:02.500", 11),    # keep
         ])
 
+    def test_deleting_in_small_batches(self):
+        smhc = SmhcSayStubbed()
+        smhc.DELETE_BATCH_SIZE = 3
+        self.write_history([
+            (4, "2013-07-13 16:30:00.000", 11),    # keep
+            (8, "2013-07-13 16:30:01.100", 11),
+            (15, "2013-07-13 16:30:01.200", 11),
+            (16, "2013-07-13 16:30:01.300", 11),    # keep
+            (23, "2013-07-13 16:30:02.400", 11),
+            (42, "2013-07-13 16:30:02.500", 11),
+            (98, "2013-07-13 16:30:02.600", 11),    # keep
+            (99, "2013-07-13 16:30:59.000", 11),    # keep
+        ])
+
+        smhc.clean_one_student_module(11)
+        self.assert_said(smhc, "Deleting 4 rows of 8 for student_module_id 11")
+        self.assert_history([
+            (4, "2013-07-13 16:30:00.000", 11),    # keep
+            (16, "2013-07-13 16:30:01.300", 11),    # keep
+            (98, "2013-07-13 16:30:02.600", 11),    # keep
+            (99, "2013-07-13 16:30:59.000", 11),    # keep
+        ])
+
+    def test_prefetched_history(self):
+        # Prefetching a range reads the history of all its modules in one query.
+        smhc = SmhcSayStubbed()
+        self.write_history([
+            (4, "2013-07-13 16:30:00.000", 11),
+            (8, "2013-07-13 16:30:01.100", 11),
+            (15, "2013-07-13 16:30:01.200", 13),
+            (16, "2013-07-13 16:30:01.300", 14),
+        ])
+
+        smhc.prefetch_history(11, 13)
+        self.assertEqual(
+            smhc.prefetched_history,
+            {
+                11: [(4, parse_date("2013-07-13 16:30:00.000")), (8, parse_date("2013-07-13 16:30:01.100"))],
+                12: [],
+                13: [(15, parse_date("2013-07-13 16:30:01.200"))],
+            }
+        )
+
+        # Cleaning a prefetched module uses the prefetched rows, even if the db changed.
+        self.write_history([
+            (17, "2013-07-13 16:30:01.350", 13),
+        ])
+        smhc.clean_one_student_module(13)
+        self.assert_said(smhc, "Deleting 0 rows of 1 for student_module_id 13")
+        self.assertNotIn(13, smhc.prefetched_history)
+
     def test_get_last_student_module(self):
         # Can we find the last student_module_id properly?
         smhc = SmhcSayStubbed()
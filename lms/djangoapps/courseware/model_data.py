@@ -61,6 +61,9 @@ class FieldDataCache(object):
         self.select_for_update = select_for_update
         self.course_id = course_id
         self.user = user
+        # Maps StudentModules to a tuple of their state string and its decoded dict,
+        # so that the state JSON is only parsed once per request
+        self._decoded_states = {}
 
         if user.is_authenticated():
             for scope, fields in self._fields_to_cache().items():
@@ -207,6 +210,33 @@ class FieldDataCache(object):
         elif scope == Scope.user_info:
             return (scope, field_object.field_name)
 
+    def get_state(self, student_module):
+        """
+        Returns the decoded `state` dict of `student_module`.
+
+        The dict is cached until `student_module.state` is reassigned, so the
+        caller must call `set_state` after modifying it.
+        """
+        state_string = student_module.state
+        cached = self._decoded_states.get(student_module)
+        if cached is None or cached[0] is not state_string:
+            cached = (state_string, json.loads(state_string))
+            self._decoded_states[student_module] = cached
+        return cached[1]
+
+    def set_state(self, student_module, state):
+        """
+        Serializes `state` into `student_module.state`.
+
+        Returns True if the serialized state differs from the previous one,
+        i.e. if `student_module` needs to be saved.
+        """
+        state_string = json.dumps(state)
+        changed = state_string != student_module.state
+        student_module.state = state_string
+        self._decoded_states[student_module] = (state_string, state)
+        return changed
+
     def find(self, key):
         '''
         Look for a model data object using an DjangoKeyValueStore.Key object
@@ -302,7 +332,7 @@ class DjangoKeyValueStore(KeyValueStore):
             raise KeyError(key.field_name)
 
         if key.scope == Scope.user_state:
-            return json.loads(field_object.state)[key.field_name]
+            return self._field_data_cache.get_state(field_object)[key.field_name]
         else:
             return json.loads(field_object.value)
 
@@ -323,6 +353,8 @@ class DjangoKeyValueStore(KeyValueStore):
         saved_fields = []
         # field_objects maps a field_object to a list of associated fields
         field_objects = dict()
+        # decoded user states that have been modified, keyed by StudentModule
+        states = dict()
         for field in kv_dict:
             # Check field for validity
             if field.scope not in self._allowed_scopes:
@@ -335,17 +367,22 @@ class DjangoKeyValueStore(KeyValueStore):
             # Update the list of associated fields
             field_objects[field_object].append(field)
 
-            # Special case when scope is for the user state, because this scope saves fields in a single row
+            # Special case when scope is for the user state, because this scope saves fields in a single row.
+            # The state is only serialized once all of its fields have been set, below.
             if field.scope == Scope.user_state:
-                state = json.loads(field_object.state)
-                state[field.field_name] = kv_dict[field]
-                field_object.state = json.dumps(state)
+                if field_object not in states:
+                    states[field_object] = self._field_data_cache.get_state(field_object)
+                states[field_object][field.field_name] = kv_dict[field]
             else:
             # The remaining scopes save fields on different rows, so
             # we don't have to worry about conflicts
                 field_object.value = json.dumps(kv_dict[field])
 
         for field_object in field_objects:
+            if field_object in states and not self._field_data_cache.set_state(field_object, states[field_object]):
+                # Nothing changed, so skip the UPDATE (and the history entry it would create)
+                saved_fields.extend([field.field_name for field in field_objects[field_object]])
+                continue
             try:
                 # Save the field object that we made above
                 field_object.save()
@@ -365,9 +402,9 @@ class DjangoKeyValueStore(KeyValueStore):
             raise KeyError(key.field_name)
 
         if key.scope == Scope.user_state:
-            state = json.loads(field_object.state)
+            state = self._field_data_cache.get_state(field_object)
             del state[key.field_name]
-            field_object.state = json.dumps(state)
+            self._field_data_cache.set_state(field_object, state)
             field_object.save()
         else:
             field_object.delete()
@@ -381,6 +418,6 @@ class DjangoKeyValueStore(KeyValueStore):
             return False
 
         if key.scope == Scope.user_state:
-            return key.field_name in json.loads(field_object.state)
+            return key.field_name in self._field_data_cache.get_state(field_object)
         else:
             return True
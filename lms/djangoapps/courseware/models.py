@@ -15,7 +15,7 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save
 from django.dispatch import receiver
 
 
@@ -107,16 +107,31 @@ class StudentModuleHistory(models.Model):
     grade = models.FloatField(null=True, blank=True)
     max_grade = models.FloatField(null=True, blank=True)
 
+    @staticmethod
+    def record(student_module):
+        """Saves a history entry with the current state and grade of `student_module`."""
+        history_entry = StudentModuleHistory(student_module=student_module,
+                                             version=None,
+                                             created=student_module.modified,
+                                             state=student_module.state,
+                                             grade=student_module.grade,
+                                             max_grade=student_module.max_grade)
+        history_entry.save()
+
+    @receiver(post_init, sender=StudentModule)
+    def remember_history_fields(sender, instance, **kwargs):
+        # Remember what was loaded, so that saves that don't change anything
+        # that is recorded in the history don't add an entry.
+        instance._history_fields = (instance.state, instance.grade, instance.max_grade)
+
     @receiver(post_save, sender=StudentModule)
-    def save_history(sender, instance, **kwargs):
+    def save_history(sender, instance, created=False, **kwargs):
+        history_fields = (instance.state, instance.grade, instance.max_grade)
+        if not created and history_fields == getattr(instance, '_history_fields', None):
+            return
+        instance._history_fields = history_fields
         if instance.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES:
-            history_entry = StudentModuleHistory(student_module=instance,
-                                                 version=None,
-                                                 created=instance.modified,
-                                                 state=instance.state,
-                                                 grade=instance.grade,
-                                                 max_grade=instance.max_grade)
-            history_entry.save()
+            StudentModuleHistory.record(instance)
 
 
 class XModuleUserStateSummaryField(models.Model):
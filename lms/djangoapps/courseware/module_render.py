@@ -33,7 +33,7 @@ from xblock.exceptions import NoSuchHandlerError
 from xblock.django.request import django_to_webob_request, webob_to_django_response
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
-from xmodule.modulestore import Location
+from xmodule.modulestore import Location, XML_MODULESTORE_TYPE
 from xmodule.modulestore.django import modulestore, ModuleI18nService
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.util.duedate import get_extended_due_date
@@ -47,6 +47,18 @@ from util.sandboxing import can_execute_unsafe_code
 
 log = logging.getLogger(__name__)
 
+# Categories of blocks that choose which of their children to display per student,
+# so a course containing them at the chapter or section level has no shared outline.
+USER_DEPENDENT_DISPLAY_CATEGORIES = ('abtest',)
+
+# Marks a course descriptor whose outline hasn't been computed yet.
+_NO_OUTLINE = object()
+
+# Outlines of courses whose content has a known version, keyed by (modulestore,
+# course id, version) (see `_course_outline`).  Emptied once it holds this many.
+_COURSE_OUTLINES = {}
+_COURSE_OUTLINES_CACHE_SIZE = 1000
+
 
 if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
     requests_auth = HTTPBasicAuth(*settings.XQUEUE_INTERFACE['basic_auth'])
@@ -90,12 +102,187 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
 
     chapters with name 'hidden' are skipped.
 
+    The table of contents is built from the cached course outline (see
+    `_course_outline`), filtered by the user's access, so no
+    XModules need to be instantiated.
+
     NOTE: assumes that if we got this far, user has access to course.  Returns
     None if this is not the case.
 
     field_data_cache must include data from the course module and 2 levels of its descendents
     '''
+    # Do not check access when it's a noauth request, as get_module_for_descriptor_internal does.
+    check_access = getattr(user, 'known', True)
 
+    # allow course staff to masquerade as student
+    if has_access(user, course, 'staff', course.id):
+        setup_masquerade(request, True)
+
+    if check_access and not has_access(user, course, 'load', course.id):
+        return None
+
+    outline = _course_outline(course)
+    if outline is None:
+        return _toc_for_course_modules(user, request, course, active_chapter, active_section, field_data_cache)
+
+    kvs = DjangoKeyValueStore(field_data_cache)
+
+    def can_load(descriptor):
+        """
+        Returns whether the user may see `descriptor`, as get_module would.
+        """
+        return not check_access or has_access(user, descriptor, 'load', course.id)
+
+    def due_date(section):
+        """
+        Returns the due date of `section`, taking into account any extension
+        granted to this user.
+        """
+        descriptor = section['descriptor']
+        if not section['due']:
+            return section['due']
+        key = KeyValueStore.Key(
+            scope=Scope.user_state,
+            user_id=user.id,
+            block_scope_id=descriptor.location,
+            field_name='extended_due'
+        )
+        try:
+            extended_due = descriptor.fields['extended_due'].from_json(kvs.get(key))
+        except KeyError:
+            extended_due = None
+        return get_extended_due_date({'due': section['due'], 'extended_due': extended_due})
+
+    chapters = list()
+    for chapter in outline:
+        if chapter['hide_from_toc'] or not can_load(chapter['descriptor']):
+            continue
+
+        sections = list()
+        for section in chapter['sections']:
+            if not can_load(section['descriptor']):
+                continue
+
+            active = (chapter['url_name'] == active_chapter and
+                      section['url_name'] == active_section)
+
+            if not section['hide_from_toc']:
+                sections.append({'display_name': section['display_name'],
+                                 'url_name': section['url_name'],
+                                 'format': section['format'],
+                                 'due': due_date(section),
+                                 'active': active,
+                                 'graded': section['graded'],
+                                 })
+
+        chapters.append({'display_name': chapter['display_name'],
+                         'url_name': chapter['url_name'],
+                         'sections': sections,
+                         'active': chapter['url_name'] == active_chapter})
+    return chapters
+
+
+def _course_outline(course):
+    """
+    Returns the user-independent outline of `course` used to build its table of contents.
+
+    The outline is a list of chapter dicts, each with a list of section dicts, holding
+    the descriptor and the content fields the table of contents needs.
+
+    Courses whose content has a known version (the version or edit time of the course
+    in the split modulestore, or the process lifetime for the XML modulestore, which
+    never changes) share their outline across requests through a bounded per-process
+    cache keyed on that version, so an edit gets a fresh outline.  Other courses (the
+    Mongo modulestore) keep it on the course descriptor, which is only reused for the
+    current request.
+
+    Returns None if the outline depends on the user, i.e. if it contains a block whose
+    displayable items are chosen per student (such as an A/B test); the table of contents
+    then has to be built from XModules.
+    """
+    key = _course_outline_key(course)
+    if key is not None:
+        if key not in _COURSE_OUTLINES:
+            if len(_COURSE_OUTLINES) >= _COURSE_OUTLINES_CACHE_SIZE:
+                _COURSE_OUTLINES.clear()
+            _COURSE_OUTLINES[key] = _build_course_outline(course)
+        return _COURSE_OUTLINES[key]
+
+    outline = getattr(course, '_toc_outline', _NO_OUTLINE)
+    if outline is _NO_OUTLINE:
+        outline = _build_course_outline(course)
+        course._toc_outline = outline  # pylint: disable=protected-access
+    return outline
+
+
+def _course_outline_key(course):
+    """
+    Returns the key the outline of `course` is cached under for the process, or None
+    if its content has no known version.
+    """
+    version = course.update_version or course.edited_on
+    store = modulestore()
+    if version is None and store.get_modulestore_type(course.id) != XML_MODULESTORE_TYPE:
+        return None
+    return (store, course.id, version)
+
+
+def _clear_course_outlines():
+    """
+    Empty the per-process cache of course outlines (for tests).
+    """
+    _COURSE_OUTLINES.clear()
+
+
+def _build_course_outline(course):
+    """
+    Computes the outline of `course` (see `_course_outline`).
+    """
+    def display_items(descriptor):
+        """
+        Returns the displayable children of `descriptor`, or None if they depend on the user.
+        """
+        children = descriptor.get_children()
+        if any(child.location.category in USER_DEPENDENT_DISPLAY_CATEGORIES for child in children):
+            return None
+        return children
+
+    chapter_descriptors = display_items(course)
+    if chapter_descriptors is None:
+        return None
+    outline = []
+    for chapter in chapter_descriptors:
+        section_descriptors = display_items(chapter)
+        if section_descriptors is None:
+            return None
+        outline.append({
+            'descriptor': chapter,
+            'display_name': chapter.display_name_with_default,
+            'url_name': chapter.url_name,
+            'hide_from_toc': chapter.hide_from_toc,
+            'sections': [
+                {
+                    'descriptor': section,
+                    'display_name': section.display_name_with_default,
+                    'url_name': section.url_name,
+                    'format': section.format if section.format is not None else '',
+                    'due': section.due,
+                    'graded': section.graded,
+                    'hide_from_toc': section.hide_from_toc,
+                }
+                for section in section_descriptors
+            ],
+        })
+    return outline
+
+
+def _toc_for_course_modules(user, request, course, active_chapter, active_section, field_data_cache):
+    '''
+    Create a table of contents by instantiating the course, chapter and section XModules.
+
+    Used for courses whose outline depends on the user.  See `toc_for_course` for the
+    return format.
+    '''
     course_module = get_module_for_descriptor(user, request, course, field_data_cache, course.id)
     if course_module is None:
         return None
@@ -363,10 +550,11 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
     # because it is agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
+    jump_to_id_base_url = reverse('jump_to_id', kwargs={'course_id': course_id, 'module_id': ''})
     block_wrappers.append(partial(
         replace_jump_to_id_urls,
         course_id,
-        reverse('jump_to_id', kwargs={'course_id': course_id, 'module_id': ''}),
+        jump_to_id_base_url,
     ))
 
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
@@ -414,7 +602,7 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
         replace_jump_to_id_urls=partial(
             static_replace.replace_jump_to_id_urls,
             course_id=course_id,
-            jump_to_id_base_url=reverse('jump_to_id', kwargs={'course_id': course_id, 'module_id': ''})
+            jump_to_id_base_url=jump_to_id_base_url
         ),
         node_path=settings.NODE_PATH,
         publish=publish,
@@ -443,10 +631,11 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
             make_psychometrics_data_update_handler(course_id, user, descriptor.location.url())
         )
 
-    system.set(u'user_is_staff', has_access(user, descriptor.location, u'staff', course_id))
+    user_is_staff = has_access(user, descriptor.location, u'staff', course_id)
+    system.set(u'user_is_staff', user_is_staff)
 
     # make an ErrorDescriptor -- assuming that the descriptor's system is ok
-    if has_access(user, descriptor.location, 'staff', course_id):
+    if user_is_staff:
         system.error_descriptor_class = ErrorDescriptor
     else:
         system.error_descriptor_class = NonStaffErrorDescriptor
@@ -2,15 +2,23 @@
 Test grade calculation.
 """
 from django.http import Http404
+from django.test import TestCase
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
-from mock import patch
+from mock import patch, Mock
 
+from capa.tests.response_xml_factory import OptionResponseXMLFactory
+from courseware.model_data import FieldDataCache
+from courseware.tests.factories import StudentModuleFactory
 from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore import Location
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
-from courseware.grades import grade, iterate_grades_for
+from courseware import grades
+from courseware.grades import grade, iterate_grades_for, get_score
 
 
 def _grade_with_errors(student, request, course, keep_raw_scores=False):
@@ -120,3 +128,112 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+class TestGetScore(TestCase):
+    """
+    Test scoring a single problem.
+    """
+    def setUp(self):
+        self.user = UserFactory.create()
+        self.descriptor = Mock(
+            always_recalculate_grades=False,
+            has_score=True,
+            location=Location('i4x', 'edX', 'test', 'problem', 'p1'),
+            weight=None,
+        )
+
+    @patch('courseware.grades.StudentModule')
+    def test_prefetched_student_modules(self, mock_student_module):
+        """Scores come from the already fetched StudentModules rather than a query"""
+        student_module = Mock(grade=3, max_grade=4)
+        module_creator = Mock()
+        student_modules = {self.descriptor.location.url(): student_module}
+        self.assertEqual(
+            get_score('edX/test/run', self.user, self.descriptor, module_creator, student_modules=student_modules),
+            (3, 4)
+        )
+
+        # a location with no StudentModule needs the problem for its max score
+        module_creator.return_value.max_score.return_value = 5
+        student_modules = {self.descriptor.location.url(): None}
+        self.assertEqual(
+            get_score('edX/test/run', self.user, self.descriptor, module_creator, student_modules=student_modules),
+            (0.0, 5)
+        )
+        self.assertFalse(mock_student_module.objects.get.called)
+
+
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+class TestSectionFieldDataCache(ModuleStoreTestCase):
+    """
+    Test that the modules of a section share one FieldDataCache when grading it.
+    """
+    def setUp(self):
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+        self.section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            metadata={'graded': True, 'format': 'Homework'}
+        )
+        problems = [
+            ItemFactory.create(
+                parent_location=self.section.location,
+                category='problem',
+                data=OptionResponseXMLFactory().build_xml(
+                    question_text='The correct answer is Correct',
+                    num_inputs=2,
+                    weight=2,
+                    options=['Correct', 'Incorrect'],
+                    correct_option='Correct'
+                ),
+                display_name='p{}'.format(index)
+            )
+            for index in range(3)
+        ]
+        self.course = modulestore().get_instance(course.id, course.location)
+        self.student = UserFactory.create()
+        # the student has only attempted the first problem, so the others are instantiated for their max score
+        StudentModuleFactory.create(
+            student=self.student,
+            course_id=self.course.id,
+            module_state_key=problems[0].location.url(),
+            grade=1,
+            max_grade=2,
+        )
+        self.request = RequestFactory().get('/')
+        self.request.user = self.student
+        self.request.session = {}
+
+    def test_section_modules_share_cache(self):
+        with patch.object(
+            FieldDataCache, 'cache_for_descriptor_descendents', wraps=FieldDataCache.cache_for_descriptor_descendents
+        ) as mock_cache_for_descendents:
+            with patch(
+                'courseware.grades.get_module_for_descriptor', wraps=grades.get_module_for_descriptor
+            ) as mock_get_module:
+                grade(self.student, self.request, self.course)
+
+        self.assertEqual(mock_cache_for_descendents.call_count, 1)
+        self.assertEqual(mock_cache_for_descendents.call_args[0][2].location, self.section.location)
+        self.assertGreaterEqual(mock_get_module.call_count, 2)
+        field_data_caches = set(id(call[0][3]) for call in mock_get_module.call_args_list)
+        self.assertEqual(len(field_data_caches), 1)
+
+    def test_grades_match_unbatched(self):
+        batched = grade(self.student, self.request, self.course, keep_raw_scores=True)
+
+        def field_data_cache_per_module(section_field_data_cache, descriptor):
+            """
+            Build a FieldDataCache for each module, as grading did before they were shared.
+            """
+            return FieldDataCache([descriptor], section_field_data_cache.course_id, section_field_data_cache.student)
+
+        with patch('courseware.grades._SectionFieldDataCache.for_descriptor', field_data_cache_per_module):
+            unbatched = grade(self.student, self.request, self.course, keep_raw_scores=True)
+
+        self.assertEqual(batched['raw_scores'], unbatched['raw_scores'])
+        self.assertEqual(batched['totaled_scores'], unbatched['totaled_scores'])
+        self.assertEqual(batched['percent'], unbatched['percent'])
+        self.assertEqual(batched['raw_scores'][0].earned, 1)
@@ -7,7 +7,7 @@ from functools import partial
 
 from courseware.model_data import DjangoKeyValueStore
 from courseware.model_data import InvalidScopeError, FieldDataCache
-from courseware.models import StudentModule, XModuleUserStateSummaryField
+from courseware.models import StudentModule, StudentModuleHistory, XModuleUserStateSummaryField
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
 from student.tests.factories import UserFactory
@@ -179,6 +179,42 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
                 self.kvs.set_many(kv_dict)
         self.assertEquals(len(exception_context.exception.saved_field_names), 0)
 
+    def test_set_unchanged_field(self):
+        "Test that setting a user_state field to its current value doesn't write to the database"
+        with patch('courseware.models.StudentModule.save') as mock_save:
+            self.kvs.set_many({user_state_key('a_field'): 'a_value'})
+        self.assertFalse(mock_save.called)
+        self.assertEquals({'b_field': 'b_value', 'a_field': 'a_value'}, json.loads(StudentModule.objects.all()[0].state))
+
+    def test_history_only_for_changes(self):
+        "Test that saving a StudentModule only records history when its state or grade changed"
+        student_module = StudentModule.objects.get()
+        history = StudentModuleHistory.objects.filter(student_module=student_module)
+        self.assertEquals(1, history.count())
+
+        student_module.save()
+        self.assertEquals(1, history.count())
+
+        student_module.grade = 1
+        student_module.save()
+        self.assertEquals(2, history.count())
+
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.assertEquals(3, history.count())
+        self.assertEquals(
+            {'b_field': 'b_value', 'a_field': 'new_value'},
+            json.loads(history.order_by('-id')[0].state)
+        )
+
+    def test_state_decoded_once(self):
+        "Test that the state of a StudentModule is only decoded once for many reads"
+        with patch('courseware.model_data.json.loads', side_effect=json.loads) as mock_loads:
+            self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
+            self.assertTrue(self.kvs.has(user_state_key('b_field')))
+            self.kvs.set(user_state_key('a_field'), 'new_value')
+            self.assertEquals('new_value', self.kvs.get(user_state_key('a_field')))
+        self.assertEquals(mock_loads.call_count, 1)
+
 
 class TestMissingStudentModule(TestCase):
     def setUp(self):
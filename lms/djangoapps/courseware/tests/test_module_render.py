@@ -9,6 +9,7 @@ import json
 from django.http import Http404, HttpResponse
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
@@ -32,6 +33,7 @@ from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
 
 from lms.lib.xblock.runtime import quote_slashes
+from xmodule_modifiers import grade_histogram, grade_histograms
 
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
@@ -313,6 +315,7 @@ class TestTOC(TestCase):
         self.course_name = 'edX/toy/2012_Fall'
         self.toy_course = modulestore().get_course(self.course_name)
         self.portal_user = UserFactory()
+        render._clear_course_outlines()  # pylint: disable=protected-access
 
     def test_toc_toy_from_chapter(self):
         chapter = 'Overview'
@@ -369,6 +372,66 @@ class TestTOC(TestCase):
         for toc_section in expected:
             self.assertIn(toc_section, actual)
 
+    def test_toc_without_modules(self):
+        chapter = 'Overview'
+        section = 'Welcome'
+        request = RequestFactory().get('%s/%s/%s' % ('/courses', self.course_name, chapter))
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.toy_course.id, self.portal_user, self.toy_course, depth=2)
+
+        with patch('courseware.module_render.get_module_for_descriptor') as mock_get_module:
+            toc = render.toc_for_course(self.portal_user, request, self.toy_course, chapter, section, field_data_cache)
+            self.assertFalse(mock_get_module.called)
+
+        # The cached outline gives the same result as instantiating the modules
+        expected = render._toc_for_course_modules(  # pylint: disable=protected-access
+            self.portal_user, request, self.toy_course, chapter, section, field_data_cache
+        )
+        self.assertEqual(toc, expected)
+
+    def test_outline_cached_for_process(self):
+        # pylint: disable=protected-access
+        with patch('courseware.module_render._build_course_outline', wraps=render._build_course_outline) as mock_build:
+            outline = render._course_outline(self.toy_course)
+            self.assertIs(render._course_outline(self.toy_course), outline)
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertFalse(hasattr(self.toy_course, '_toc_outline'))
+
+    def _mock_course(self, update_version):
+        """
+        Returns a mock course descriptor with the given content version.
+        """
+        course = Mock(spec=['id', 'update_version', 'edited_on'])
+        course.id = self.course_name
+        course.update_version = update_version
+        course.edited_on = None
+        return course
+
+    def test_outline_cached_per_version(self):
+        course = self._mock_course('version1')
+        # pylint: disable=protected-access
+        with patch('courseware.module_render._build_course_outline', return_value=[]) as mock_build:
+            render._course_outline(course)
+            render._course_outline(course)
+            self.assertEqual(mock_build.call_count, 1)
+
+            # Editing the course gives it a new version, and so a new outline
+            course.update_version = 'version2'
+            render._course_outline(course)
+            self.assertEqual(mock_build.call_count, 2)
+
+    def test_outline_without_version_kept_on_course(self):
+        course = self._mock_course(None)
+        # pylint: disable=protected-access
+        with patch('courseware.module_render.modulestore') as mock_modulestore:
+            mock_modulestore.return_value.get_modulestore_type.return_value = 'mongo'
+            with patch('courseware.module_render._build_course_outline', return_value=[]) as mock_build:
+                render._course_outline(course)
+                render._course_outline(course)
+                render._course_outline(self._mock_course(None))
+        self.assertEqual(mock_build.call_count, 2)
+        self.assertEqual(render._COURSE_OUTLINES, {})
+
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 class TestHtmlModifiers(ModuleStoreTestCase):
@@ -624,6 +687,26 @@ class TestStaffDebugInfo(ModuleStoreTestCase):
             module.render('student_view')
             self.assertTrue(mock_grade_histogram.called)
 
+    def test_grade_histograms(self):
+        """Histograms for many modules are computed together and cached."""
+        other_location = self.location.replace(name='other_problem')
+        for grade, location in ((1, self.location), (1, self.location), (0, self.location), (2, other_location)):
+            StudentModuleFactory.create(
+                course_id=self.course.id,
+                module_state_key=location.url(),
+                grade=grade,
+                max_grade=2,
+                state="{}",
+            )
+        expected = {
+            self.location.url(): [(0, 1), (1, 2)],
+            other_location.url(): [(2, 1)],
+        }
+        cache.clear()
+        self.assertEqual(expected, grade_histograms(expected.keys()))
+        with self.assertNumQueries(0):
+            self.assertEqual(expected[self.location.url()], grade_histogram(self.location.url()))
+
 
 PER_COURSE_ANONYMIZED_DESCRIPTORS = (LTIDescriptor, )
 
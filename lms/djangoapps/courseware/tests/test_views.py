@@ -132,6 +132,26 @@ class ViewsTestCase(TestCase):
         mock_xmodule_2.get_display_items.return_value = []
         self.assertIsNone(views.get_current_child(mock_xmodule_2))
 
+    def test_save_child_position(self):
+        mock_child = MagicMock()
+        mock_child.url_name = 'two'
+        mock_module = MagicMock()
+        mock_module.position = 1
+        mock_module.get_display_items.return_value = [MagicMock(url_name='one'), mock_child]
+
+        self.assertTrue(views.save_child_position(mock_module, 'two'))
+        self.assertEquals(mock_module.position, 2)
+        self.assertEquals(mock_module.save.call_count, 1)
+
+        # Revisiting the same child doesn't write the position again
+        self.assertFalse(views.save_child_position(mock_module, 'two'))
+        self.assertEquals(mock_module.save.call_count, 1)
+
+        # Neither does an unknown child
+        self.assertFalse(views.save_child_position(mock_module, 'three'))
+        self.assertEquals(mock_module.position, 2)
+        self.assertEquals(mock_module.save.call_count, 1)
+
     def test_redirect_to_course_position(self):
         mock_module = MagicMock()
         mock_module.descriptor.id = 'Underwater Basketweaving'
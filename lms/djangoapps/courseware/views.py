@@ -36,6 +36,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import InvalidLocationError, ItemNotFoundError, NoPathToItem
 from xmodule.modulestore.search import path_to_location
 from xmodule.course_module import CourseDescriptor
+from xmodule_modifiers import prefetch_grade_histograms
 import shoppingcart
 
 from microsite_configuration import microsite
@@ -164,14 +165,21 @@ def redirect_to_course_position(course_module):
 def save_child_position(seq_module, child_name):
     """
     child_name: url_name of the child
+
+    The position is only written to the underlying KeyValueStore when it
+    changed, so that revisiting the same page doesn't cause a database write.
+    Returns True if the position was saved.
     """
     for position, c in enumerate(seq_module.get_display_items(), start=1):
         if c.url_name == child_name:
             # Only save if position changed
             if position != seq_module.position:
                 seq_module.position = position
-    # Save this new position to the underlying KeyValueStore
-    seq_module.save()
+                # Save this new position to the underlying KeyValueStore
+                seq_module.save()
+                return True
+            break
+    return False
 
 
 def chat_settings(course, user):
@@ -326,6 +334,12 @@ def index(request, course_id, chapter=None, section=None,
                 # they don't have access to.
                 raise Http404
 
+            # Staff debug info shows a grade histogram for every problem in the section,
+            # so fetch them all at once before rendering
+            if (staff_access and settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF') and
+                    settings.FEATURES.get('DISPLAY_HISTOGRAMS_TO_STAFF')):
+                prefetch_grade_histograms(section_descriptor)
+
             # Save where we are in the chapter
             save_child_position(chapter_module, section)
             context['fragment'] = section_module.render('student_view')
@@ -723,9 +737,9 @@ def submission_history(request, course_id, student_username, location):
         student_module=student_module
     ).order_by('-id')
 
-    # If no history records exist, let's force a save to get history started.
-    if not history_entries:
-        student_module.save()
+    # If no history records exist, let's record the current state to get history started.
+    if not history_entries and student_module.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES:
+        StudentModuleHistory.record(student_module)
         history_entries = StudentModuleHistory.objects.filter(
             student_module=student_module
         ).order_by('-id')
@@ -5,41 +5,89 @@ Does not include any access control, be sure to check access before calling.
 """
 
 import json
+import logging
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.mail import send_mail
 
-from student.models import CourseEnrollment, CourseEnrollmentAllowed
+from student.models import CourseEnrollment, CourseEnrollmentAllowed, UserProfile
 from courseware.models import StudentModule
+from util.db import all_or_nothing
 from edxmako.shortcuts import render_to_string
 
 from microsite_configuration import microsite
 
+log = logging.getLogger(__name__)
+
 # For determining if a shibboleth course
 SHIBBOLETH_DOMAIN_PREFIX = 'shib:'
 
 
 class EmailEnrollmentState(object):
     """ Store the complete enrollment state of an email in a class """
-    def __init__(self, course_id, email):
-        exists_user = User.objects.filter(email=email).exists()
-        if exists_user:
+    def __init__(self, course_id, email, fetched=None):
+        """
+        `fetched` is the state of the email if it has already been fetched from
+        the db (see `for_emails`), as a (user, enrolled, cea, full_name) tuple:
+        the User with the email or None, whether they are enrolled, the email's
+        CourseEnrollmentAllowed or None, and the user's full name or None.
+        """
+        if fetched is None:
+            fetched = self._fetch(course_id, email)
+        user, enrolled, cea, full_name = fetched
+
+        self.user = user is not None
+        self.enrollment = enrolled
+        self.allowed = cea is not None
+        self.auto_enroll = bool(cea is not None and cea.auto_enroll)
+        self.full_name = full_name
+
+    @staticmethod
+    def _fetch(course_id, email):
+        """
+        Fetch the state of one email from the db, as `__init__` takes it.
+        """
+        user = None
+        enrolled = False
+        full_name = None
+        if User.objects.filter(email=email).exists():
             user = User.objects.get(email=email)
-            exists_ce = CourseEnrollment.is_enrolled(user, course_id)
+            enrolled = CourseEnrollment.is_enrolled(user, course_id)
             full_name = user.profile.name
-        else:
-            exists_ce = False
-            full_name = None
         ceas = CourseEnrollmentAllowed.objects.filter(course_id=course_id, email=email).all()
-        exists_allowed = len(ceas) > 0
-        state_auto_enroll = exists_allowed and ceas[0].auto_enroll
+        cea = ceas[0] if len(ceas) > 0 else None
+        return user, enrolled, cea, full_name
 
-        self.user = exists_user
-        self.enrollment = exists_ce
-        self.allowed = exists_allowed
-        self.auto_enroll = bool(state_auto_enroll)
-        self.full_name = full_name
+    @classmethod
+    def for_emails(cls, course_id, emails):
+        """
+        The enrollment states of many emails at once, fetched with a few queries
+        rather than several per email.
+
+        Returns a dict of email -> EmailEnrollmentState, and a dict of email -> User
+        for the emails which belong to users.
+        """
+        users = _users_by_email(emails)
+        enrolled_user_ids = set(CourseEnrollment.objects.filter(
+            course_id=course_id, user__in=users.values(), is_active=True
+        ).values_list('user_id', flat=True))
+        full_names = dict(UserProfile.objects.filter(user__in=users.values()).values_list('user_id', 'name'))
+        allowed = dict(
+            (cea.email.lower(), cea)
+            for cea in CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=emails)
+        )
+
+        states = {}
+        for email in emails:
+            user = users.get(email)
+            states[email] = cls(course_id, email, fetched=(
+                user,
+                user is not None and user.id in enrolled_user_ids,
+                allowed.get(email.lower()),
+                full_names.get(user.id) if user is not None else None,
+            ))
+        return states, users
 
     def __repr__(self):
         return "{}(user={}, enrollment={}, allowed={}, auto_enroll={})".format(
@@ -140,6 +188,118 @@ def unenroll_email(course_id, student_email, email_students=False, email_params=
     return previous_state, after_state
 
 
+def enroll_emails(course_id, student_emails, auto_enroll=False, email_students=False, email_params=None):
+    """
+    Enroll many students by email at once, as `enroll_email` would each of them,
+    but enrolling the registered students together.
+
+    returns a list of (email, previous_state, after_state) tuples, in the
+        order of `student_emails`.  after_state is None for the emails that
+        failed; the others are done even so.  If this raises, the changes made
+        to the students are rolled back (in a transaction, as requests are) so
+        that they can be retried.
+    """
+    previous_states, users = EmailEnrollmentState.for_emails(course_id, student_emails)
+
+    CourseEnrollment.enroll_users(
+        [users[email] for email in student_emails if email in users], course_id
+    )
+    failed = set()
+    for email in student_emails:
+        try:
+            if email in users:
+                if email_students:
+                    email_params['message'] = 'enrolled_enroll'
+                    email_params['email_address'] = email
+                    email_params['full_name'] = previous_states[email].full_name
+                    send_mail_to_student(email, email_params)
+            else:
+                cea, _ = CourseEnrollmentAllowed.objects.get_or_create(course_id=course_id, email=email)
+                cea.auto_enroll = auto_enroll
+                cea.save()
+                if email_students:
+                    email_params['message'] = 'allowed_enroll'
+                    email_params['email_address'] = email
+                    send_mail_to_student(email, email_params)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u"Error while enrolling %s in %s", email, course_id)
+            failed.add(email)
+
+    return _with_after_states(course_id, student_emails, previous_states, failed)
+
+
+def unenroll_emails(course_id, student_emails, email_students=False, email_params=None):
+    """
+    Unenroll many students by email at once, as `unenroll_email` would each of them,
+    but unenrolling the registered students together.
+
+    returns a list of (email, previous_state, after_state) tuples, in the
+        order of `student_emails`.  after_state is None for the emails that
+        failed; the others are done even so.  If this raises, the changes made
+        to the students are rolled back (in a transaction, as requests are) so
+        that they can be retried.
+    """
+    previous_states, users = EmailEnrollmentState.for_emails(course_id, student_emails)
+
+    enrolled_emails = [email for email in student_emails if previous_states[email].enrollment]
+    allowed_emails = [email for email in student_emails if previous_states[email].allowed]
+    with all_or_nothing():
+        CourseEnrollment.unenroll_users([users[email] for email in enrolled_emails], course_id)
+        if allowed_emails:
+            CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=allowed_emails).delete()
+
+    failed = set()
+    if email_students:
+        for email in student_emails:
+            try:
+                if previous_states[email].enrollment:
+                    email_params['message'] = 'enrolled_unenroll'
+                    email_params['email_address'] = email
+                    email_params['full_name'] = previous_states[email].full_name
+                    send_mail_to_student(email, email_params)
+                if previous_states[email].allowed:
+                    email_params['message'] = 'allowed_unenroll'
+                    email_params['email_address'] = email
+                    # Since no User object exists for this student there is no "full_name" available.
+                    send_mail_to_student(email, email_params)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u"Error while notifying %s of unenrollment from %s", email, course_id)
+                failed.add(email)
+
+    return _with_after_states(course_id, student_emails, previous_states, failed)
+
+
+def _with_after_states(course_id, student_emails, previous_states, failed):
+    """
+    Returns the (email, previous_state, after_state) tuples of `enroll_emails`
+    and `unenroll_emails`, with after_state None for the `failed` emails.
+
+    The students have already been updated by now, so rather than raise (and
+    have them updated again), every email is reported as failed if the after
+    states can't be read.
+    """
+    try:
+        after_states, __ = EmailEnrollmentState.for_emails(course_id, student_emails)
+    except Exception:  # pylint: disable=broad-except
+        log.exception(u"Error while reading the enrollment states in %s", course_id)
+        after_states = {}
+    return [
+        (email, previous_states[email], None if email in failed else after_states.get(email))
+        for email in student_emails
+    ]
+
+
+def _users_by_email(emails):
+    """
+    Returns a dict of email -> User for those of `emails` which belong to users.
+    Emails are matched as the database matches them in a lookup by email.
+    """
+    users = dict((user.email.lower(), user) for user in User.objects.filter(email__in=emails))
+    return dict(
+        (email, users[email.lower()]) for email in emails if email.lower() in users
+    )
+
+
 def reset_student_attempts(course_id, student, module_state_key, delete_module=False):
     """
     Reset student attempts for a problem. Optionally deletes all student state for the specified problem.
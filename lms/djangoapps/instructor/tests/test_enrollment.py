@@ -4,13 +4,16 @@ Unit tests for instructor.enrollment methods.
 
 import json
 from abc import ABCMeta
+from mock import patch
 from courseware.models import StudentModule
+from django.contrib.auth.models import User
 from django.test import TestCase
 from student.tests.factories import UserFactory
 
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from instructor.enrollment import (EmailEnrollmentState,
                                    enroll_email, unenroll_email,
+                                   enroll_emails, unenroll_emails,
                                    reset_student_attempts)
 
 
@@ -271,6 +274,69 @@ class TestInstructorUnenrollDB(TestEnrollmentChangeBase):
         return self._run_state_change_test(before_ideal, after_ideal, action)
 
 
+class TestInstructorBulkEnrollDB(TestCase):
+    """ Test instructor.enrollment.enroll_emails and unenroll_emails """
+    def setUp(self):
+        self.course_id = 'robot:/a/fake/c::rse/id'
+        self.enrolled = SettableEnrollmentState(user=True, enrollment=True).create_user(self.course_id).email
+        self.registered = SettableEnrollmentState(user=True).create_user(self.course_id).email
+        self.allowed = SettableEnrollmentState(allowed=True, auto_enroll=True).create_user(self.course_id).email
+        self.emails = [self.enrolled, self.registered, self.allowed]
+
+    def test_states_for_emails(self):
+        states, users = EmailEnrollmentState.for_emails(self.course_id, self.emails)
+        for email in self.emails:
+            self.assertEqual(
+                states[email].to_dict(),
+                EmailEnrollmentState(self.course_id, email).to_dict()
+            )
+        self.assertEqual(sorted(users), sorted([self.enrolled, self.registered]))
+
+    def test_enroll_emails(self):
+        results = enroll_emails(self.course_id, self.emails)
+        self.assertEqual([email for email, __, __ in results], self.emails)
+        after_states = dict((email, after.to_dict()) for email, __, after in results)
+        self.assertEqual(
+            after_states[self.enrolled],
+            SettableEnrollmentState(user=True, enrollment=True).to_dict()
+        )
+        self.assertEqual(
+            after_states[self.registered],
+            SettableEnrollmentState(user=True, enrollment=True).to_dict()
+        )
+        self.assertEqual(
+            after_states[self.allowed],
+            SettableEnrollmentState(allowed=True, auto_enroll=False).to_dict()
+        )
+
+    def test_unenroll_emails(self):
+        results = unenroll_emails(self.course_id, self.emails)
+        for email, __, after in results:
+            self.assertEqual(
+                after.to_dict(),
+                SettableEnrollmentState(user=(email != self.allowed)).to_dict()
+            )
+
+    def test_enroll_emails_with_failing_email(self):
+        def send_mail(email, __):
+            """Fail to send the mail for one of the students."""
+            if email == self.registered:
+                raise Exception("mail server down")
+
+        with patch('instructor.enrollment.send_mail_to_student', side_effect=send_mail) as send_mail_to_student:
+            results = enroll_emails(self.course_id, self.emails, email_students=True, email_params={})
+
+        # each student is mailed once, and the one that failed is reported
+        self.assertEqual(send_mail_to_student.call_count, 3)
+        after_states = dict((email, after) for email, __, after in results)
+        self.assertIsNone(after_states[self.registered])
+        self.assertEqual(
+            after_states[self.enrolled].to_dict(),
+            SettableEnrollmentState(user=True, enrollment=True).to_dict()
+        )
+        self.assertTrue(CourseEnrollment.is_enrolled(User.objects.get(email=self.registered), self.course_id))
+
+
 class TestInstructorEnrollmentStudentModule(TestCase):
     """ Test student module manipulations. """
     def setUp(self):
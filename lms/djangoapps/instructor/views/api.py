@@ -8,6 +8,7 @@ Many of these GETs may become PUTs in the future.
 
 import json
 import logging
+from functools import partial
 import re
 import requests
 from django.conf import settings
@@ -37,7 +38,9 @@ from instructor_task.api_helper import AlreadyRunningError
 from instructor_task.views import get_task_completion_info
 from instructor_task.models import ReportStore
 import instructor.enrollment as enrollment
-from instructor.enrollment import enroll_email, unenroll_email, get_email_params
+from instructor.enrollment import (
+    enroll_email, enroll_emails, unenroll_email, unenroll_emails, get_email_params
+)
 from instructor.access import list_with_level, allow_access, revoke_access, update_forum_role
 import analytics.basic
 import analytics.distributions
@@ -243,32 +246,55 @@ def students_update_enrollment(request, course_id):
         course = get_course_by_id(course_id)
         email_params = get_email_params(course, auto_enroll)
 
+    if action == 'enroll':
+        update_all = partial(enroll_emails, course_id, emails, auto_enroll, email_students, email_params)
+        update_one = lambda email: enroll_email(course_id, email, auto_enroll, email_students, email_params)
+    elif action == 'unenroll':
+        update_all = partial(unenroll_emails, course_id, emails, email_students, email_params)
+        update_one = lambda email: unenroll_email(course_id, email, email_students, email_params)
+    else:
+        return HttpResponseBadRequest(strip_tags(
+            "Unrecognized action '{}'".format(action)
+        ))
+
     results = []
-    for email in emails:
-        try:
-            if action == 'enroll':
-                before, after = enroll_email(course_id, email, auto_enroll, email_students, email_params)
-            elif action == 'unenroll':
-                before, after = unenroll_email(course_id, email, email_students, email_params)
+    try:
+        # update all the students together, which reports the ones in error itself
+        for email, before, after in update_all():
+            if after is None:
+                results.append({
+                    'email': email,
+                    'error': True,
+                })
             else:
-                return HttpResponseBadRequest(strip_tags(
-                    "Unrecognized action '{}'".format(action)
-                ))
-
-            results.append({
-                'email': email,
-                'before': before.to_dict(),
-                'after': after.to_dict(),
-            })
-        # catch and log any exceptions
-        # so that one error doesn't cause a 500.
-        except Exception as exc:  # pylint: disable=W0703
-            log.exception("Error while #{}ing student")
-            log.exception(exc)
-            results.append({
-                'email': email,
-                'error': True,
-            })
+                results.append({
+                    'email': email,
+                    'before': before.to_dict(),
+                    'after': after.to_dict(),
+                })
+    except Exception:  # pylint: disable=W0703
+        # go through the students not done yet one by one, to find and report the ones in error
+        log.exception("Error while %sing students together, retrying one at a time", action)
+        done = set(result['email'] for result in results)
+        for email in emails:
+            if email in done:
+                continue
+            try:
+                before, after = update_one(email)
+                results.append({
+                    'email': email,
+                    'before': before.to_dict(),
+                    'after': after.to_dict(),
+                })
+            # catch and log any exceptions
+            # so that one error doesn't cause a 500.
+            except Exception as exc:  # pylint: disable=W0703
+                log.exception("Error while #{}ing student")
+                log.exception(exc)
+                results.append({
+                    'email': email,
+                    'error': True,
+                })
 
     response_payload = {
         'action': action,
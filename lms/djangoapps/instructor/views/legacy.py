@@ -1310,6 +1310,7 @@ def _do_enroll_students(course, course_id, students, overload=False, auto_enroll
              'is_shib_course': is_shib_course
              }
 
+    to_enroll = []
     for student in new_students:
         try:
             user = User.objects.get(email=student)
@@ -1347,9 +1348,26 @@ def _do_enroll_students(course, course_id, students, overload=False, auto_enroll
             status[student] = 'already enrolled'
             continue
 
+        #Not enrolled yet
+        to_enroll.append((student, user))
+
+    # Enroll the registered students together, or if that fails, one at a time
+    # to find the ones that can't be enrolled
+    try:
+        CourseEnrollment.enroll_users([user for __, user in to_enroll], course_id)
+        enrolled = to_enroll
+    except Exception:  # pylint: disable=broad-except
+        log.exception("Error while enrolling students in %s together, retrying one at a time", course_id)
+        enrolled = []
+        for student, user in to_enroll:
+            try:
+                CourseEnrollment.enroll(user, course_id)
+                enrolled.append((student, user))
+            except Exception:  # pylint: disable=broad-except
+                status[student] = 'rejected'
+
+    for student, user in enrolled:
         try:
-            #Not enrolled yet
-            ce = CourseEnrollment.enroll(user, course_id)
             status[student] = 'added'
 
             if email_students:
@@ -1399,6 +1417,7 @@ def _do_unenroll_students(course_id, students, email_students=False):
         d = {'site_name': stripped_site_name,
              'course': course}
 
+    to_unenroll = []
     for student in old_students:
 
         isok = False
@@ -1424,21 +1443,39 @@ def _do_unenroll_students(course_id, students, email_students=False):
 
         #Will be 0 or 1 records as there is a unique key on user + course_id
         if CourseEnrollment.is_enrolled(user, course_id):
+            to_unenroll.append((student, user, isok))
+
+    # Un-enroll the enrolled students together, or if that fails, one at a time
+    # to find the ones that can't be un-enrolled
+    try:
+        CourseEnrollment.unenroll_users([user for __, user, __ in to_unenroll], course_id)
+        unenrolled = to_unenroll
+    except Exception:  # pylint: disable=broad-except
+        log.exception("Error while un-enrolling students from %s together, retrying one at a time", course_id)
+        unenrolled = []
+        for student, user, isok in to_unenroll:
             try:
                 CourseEnrollment.unenroll(user, course_id)
-                status[student] = "un-enrolled"
-                if email_students:
-                    #User was enrolled
-                    d['email_address'] = student
-                    d['full_name'] = user.profile.name
-                    d['message'] = 'enrolled_unenroll'
-                    send_mail_ret = send_mail_to_student(student, d)
-                    status[student] += (', email sent' if send_mail_ret else '')
-
-            except Exception:
+                unenrolled.append((student, user, isok))
+            except Exception:  # pylint: disable=broad-except
                 if not isok:
                     status[student] = "Error!  Failed to un-enroll"
 
+    for student, user, isok in unenrolled:
+        try:
+            status[student] = "un-enrolled"
+            if email_students:
+                #User was enrolled
+                d['email_address'] = student
+                d['full_name'] = user.profile.name
+                d['message'] = 'enrolled_unenroll'
+                send_mail_ret = send_mail_to_student(student, d)
+                status[student] += (', email sent' if send_mail_ret else '')
+
+        except Exception:
+            if not isok:
+                status[student] = "Error!  Failed to un-enroll"
+
     datatable = {'header': ['StudentEmail', 'action']}
     datatable['data'] = [[x, status[x]] for x in sorted(status)]
     datatable['title'] = _u('Un-enrollment of students')
@@ -17,6 +17,7 @@ import uuid
 
 from boto.s3.connection import S3Connection
 from boto.s3.key import Key
+import crum
 import pytz
 import requests
 
@@ -34,6 +35,7 @@ from verify_student.ssencrypt import (
 )
 
 from reverification.models import MidcourseReverificationWindow
+from request_cache.middleware import RequestCache
 
 log = logging.getLogger(__name__)
 
@@ -43,6 +45,22 @@ def generateUUID():  # pylint: disable=C0103
     return str(uuid.uuid4())
 
 
+def _request_cache(name):
+    """
+    Returns the dict called `name` in the current request's cache.  Outside of
+    a request (management commands, celery tasks) nothing would ever clear the
+    cache, so a new empty dict is returned instead.
+    """
+    if crum.get_current_request() is None:
+        return {}
+    return RequestCache.get_request_cache().data.setdefault(name, {})
+
+
+def _most_recently_updated_first(attempts):
+    """ Returns `attempts` sorted with the most recently updated first """
+    return sorted(attempts, key=lambda attempt: attempt.updated_at, reverse=True)
+
+
 class VerificationException(Exception):
     pass
 
@@ -181,6 +199,53 @@ class PhotoVerification(StatusModel):
         abstract = True
         ordering = ['-created_at']
 
+    def save(self, *args, **kwargs):
+        super(PhotoVerification, self).save(*args, **kwargs)
+        # don't answer questions about this user from stale attempts later in the request
+        self._forget_attempts(self.user_id)
+
+    @classmethod
+    def _attempts_cache(cls):
+        """ The current request's cache of user id -> attempts """
+        return _request_cache(u"verify_student.{}.attempts".format(cls.__name__))
+
+    @classmethod
+    def _forget_attempts(cls, user_id):
+        """ Drops the user's attempts from the current request's cache """
+        cls._attempts_cache().pop(user_id, None)
+
+    @classmethod
+    def attempts_for_users(cls, user_ids):
+        """
+        Return a dict of user id -> all of that user's attempts, for every
+        window, most recently created first.
+
+        The attempts of the users who haven't been looked at yet in this request
+        are loaded in a single query and kept for the rest of the request, so
+        that the status methods below, which all answer from these attempts,
+        can be called repeatedly for the same users without more queries.
+        """
+        cached = cls._attempts_cache()
+        missing = [user_id for user_id in user_ids if user_id not in cached]
+        if missing:
+            for user_id in missing:
+                cached[user_id] = []
+            for attempt in cls.objects.filter(user__in=missing).order_by('-created_at'):
+                cached[attempt.user_id].append(attempt)
+        return dict((user_id, cached[user_id]) for user_id in user_ids)
+
+    @classmethod
+    def _attempts_for_user(cls, user, window=None):
+        """
+        Return the user's attempts for `window` (the initial verification if
+        window=None), most recently created first.
+        """
+        window_id = window.id if window is not None else None
+        return [
+            attempt for attempt in cls.attempts_for_users([user.id])[user.id]
+            if attempt.window_id == window_id
+        ]
+
     ##### Methods listed in the order you'd typically call them
     @classmethod
     def _earliest_allowed_date(cls):
@@ -205,13 +270,29 @@ class PhotoVerification(StatusModel):
         If window is set to anything else, it will check for the reverification
         associated with that window.
         """
-        return cls.objects.filter(
-            user=user,
-            status="approved",
-            created_at__gte=(earliest_allowed_date
-                             or cls._earliest_allowed_date()),
-            window=window
-        ).exists()
+        earliest_allowed_date = earliest_allowed_date or cls._earliest_allowed_date()
+        return any(
+            attempt.status == "approved" and attempt.created_at >= earliest_allowed_date
+            for attempt in cls._attempts_for_user(user, window)
+        )
+
+    @classmethod
+    def verified_user_ids(cls, user_ids, earliest_allowed_date=None, window=None):
+        """
+        Return the set of ids, among `user_ids`, of the users who have
+        satisfactorily proved their identity, as `user_is_verified` would say
+        for each of them, in a single query.
+        """
+        earliest_allowed_date = earliest_allowed_date or cls._earliest_allowed_date()
+        window_id = window.id if window is not None else None
+        return set(
+            user_id for user_id, attempts in cls.attempts_for_users(user_ids).iteritems()
+            if any(
+                attempt.status == "approved" and attempt.created_at >= earliest_allowed_date
+                and attempt.window_id == window_id
+                for attempt in attempts
+            )
+        )
 
     @classmethod
     def user_has_valid_or_pending(cls, user, earliest_allowed_date=None, window=None):
@@ -229,13 +310,11 @@ class PhotoVerification(StatusModel):
         valid_statuses = ['submitted', 'approved']
         if not window:
             valid_statuses.append('must_retry')
-        return cls.objects.filter(
-            user=user,
-            status__in=valid_statuses,
-            created_at__gte=(earliest_allowed_date
-                             or cls._earliest_allowed_date()),
-            window=window,
-        ).exists()
+        earliest_allowed_date = earliest_allowed_date or cls._earliest_allowed_date()
+        return any(
+            attempt.status in valid_statuses and attempt.created_at >= earliest_allowed_date
+            for attempt in cls._attempts_for_user(user, window)
+        )
 
     @classmethod
     def active_for_user(cls, user, window=None):
@@ -248,7 +327,9 @@ class PhotoVerification(StatusModel):
         """
         # This should only be one at the most, but just in case we create more
         # by mistake, we'll grab the most recently created one.
-        active_attempts = cls.objects.filter(user=user, status='ready', window=window).order_by('-created_at')
+        active_attempts = [
+            attempt for attempt in cls._attempts_for_user(user, window) if attempt.status == 'ready'
+        ]
         if active_attempts:
             return active_attempts[0]
         else:
@@ -283,7 +364,7 @@ class PhotoVerification(StatusModel):
             # we need to check the most recent attempt to see if we need to ask them to do
             # a retry
             try:
-                attempts = cls.objects.filter(user=user, window=window).order_by('-updated_at')
+                attempts = _most_recently_updated_first(cls._attempts_for_user(user, window))
                 attempt = attempts[0]
             except IndexError:
 
@@ -475,6 +556,7 @@ class PhotoVerification(StatusModel):
         """
         user = User.objects.get(id=user_id)
         cls.objects.filter(user=user, status="denied").exclude(window=None).update(display=False)
+        cls._forget_attempts(user.id)
 
     @classmethod
     def display_status(cls, user, window):
@@ -482,7 +564,7 @@ class PhotoVerification(StatusModel):
         Finds the `display` property for the PhotoVerification associated with
         (user, window). Default is True
         """
-        attempts = cls.objects.filter(user=user, window=window).order_by('-updated_at')
+        attempts = _most_recently_updated_first(cls._attempts_for_user(user, window))
         try:
             attempt = attempts[0]
             return attempt.display
@@ -540,31 +622,41 @@ class SoftwareSecurePhotoVerification(PhotoVerification):
         This is used primarily by the certificate generation code... if the user is
         not re-verified for all windows, then they cannot receive a certificate.
         """
-        all_windows = MidcourseReverificationWindow.objects.filter(course_id=course_id)
-        # if there are no windows for a course, then return True right off
-        if (not all_windows.exists()):
-            return True
+        return user.id in cls.reverified_for_all_user_ids(course_id, [user.id])
 
-        for window in all_windows:
-            try:
-                # The status of the most recent reverification for each window must be "approved"
-                # for a student to count as completely reverified
-                attempts = cls.objects.filter(user=user, window=window).order_by('-updated_at')
-                attempt = attempts[0]
-                if attempt.status != "approved":
-                    return False
-            except Exception:  # pylint: disable=W0703
-                return False
-
-        return True
+    @classmethod
+    def reverified_for_all_user_ids(cls, course_id, user_ids):
+        """
+        Return the set of ids, among `user_ids`, of the users who have
+        successfully reverified for all of the course's re-verification
+        windows, as `user_is_reverified_for_all` would say for each of them,
+        in a couple of queries.
+        """
+        course_windows = _request_cache("verify_student.reverification_windows")
+        if course_id not in course_windows:
+            course_windows[course_id] = list(MidcourseReverificationWindow.objects.filter(course_id=course_id))
+        all_windows = course_windows[course_id]
+        # if there are no windows for a course, then everyone is reverified
+        if not all_windows:
+            return set(user_ids)
+
+        reverified = set()
+        for user_id, attempts in cls.attempts_for_users(user_ids).iteritems():
+            # The status of the most recent reverification for each window must be "approved"
+            # for a student to count as completely reverified
+            latest_statuses = {}
+            for attempt in reversed(_most_recently_updated_first(attempts)):
+                latest_statuses[attempt.window_id] = attempt.status
+            if all(latest_statuses.get(window.id) == "approved" for window in all_windows):
+                reverified.add(user_id)
+        return reverified
 
     @classmethod
     def original_verification(cls, user):
         """
         Returns the most current SoftwareSecurePhotoVerification object associated with the user.
         """
-        query = cls.objects.filter(user=user, window=None).order_by('-updated_at')
-        return query[0]
+        return _most_recently_updated_first(cls._attempts_for_user(user))[0]
 
     @status_before_must_be("created")
     def upload_face_image(self, img_data):
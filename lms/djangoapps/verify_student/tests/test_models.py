@@ -12,6 +12,7 @@ from django.conf import settings
 import requests
 import requests.exceptions
 
+from request_cache.middleware import RequestCache
 from student.tests.factories import UserFactory
 from verify_student.models import (
     SoftwareSecurePhotoVerification, VerificationException,
@@ -307,6 +308,27 @@ class TestPhotoVerification(TestCase):
         attempt.save()
         assert_true(SoftwareSecurePhotoVerification.user_is_verified(user), status)
 
+    @patch('verify_student.models.crum.get_current_request')
+    def test_status_within_request(self, mock_get_current_request):
+        mock_get_current_request.return_value = object()
+        self.addCleanup(RequestCache().clear_request_cache)
+        user = UserFactory.create()
+        attempt = SoftwareSecurePhotoVerification(user=user, status="submitted")
+        attempt.save()
+
+        # the user's attempts are loaded once for the request
+        with self.assertNumQueries(1):
+            assert_false(SoftwareSecurePhotoVerification.user_is_verified(user))
+            assert_true(SoftwareSecurePhotoVerification.user_has_valid_or_pending(user))
+            assert_is_none(SoftwareSecurePhotoVerification.active_for_user(user))
+            assert_equals(SoftwareSecurePhotoVerification.user_status(user), ('pending', ''))
+            assert_equals(SoftwareSecurePhotoVerification.original_verification(user), attempt)
+
+        # saving an attempt makes later calls see the change
+        attempt.status = "approved"
+        attempt.save()
+        assert_true(SoftwareSecurePhotoVerification.user_is_verified(user))
+
     def test_user_has_valid_or_pending(self):
         """
         Determine whether we have to prompt this user to verify, or if they've
@@ -484,6 +506,31 @@ class TestMidcourseReverification(TestCase):
         # should now return True because all windows have approved verifications
         self.assertTrue(SoftwareSecurePhotoVerification.user_is_reverified_for_all(self.course_id, self.user))
 
+    def test_reverified_for_all_user_ids(self):
+        other_user = UserFactory.create()
+        user_ids = [self.user.id, other_user.id]
+
+        # if there are no windows for a course, everyone is reverified
+        self.assertEqual(
+            SoftwareSecurePhotoVerification.reverified_for_all_user_ids(self.course_id, user_ids),
+            set(user_ids)
+        )
+
+        window = MidcourseReverificationWindowFactory(
+            course_id=self.course_id,
+            start_date=datetime.now(pytz.UTC) - timedelta(days=15),
+            end_date=datetime.now(pytz.UTC) - timedelta(days=13),
+        )
+        SoftwareSecurePhotoVerification(status="approved", user=self.user, window=window).save()
+        SoftwareSecurePhotoVerification(status="approved", user=other_user, window=window).save()
+        # only the most recent attempt for the window counts
+        SoftwareSecurePhotoVerification(status="must_retry", user=other_user, window=window).save()
+
+        self.assertEqual(
+            SoftwareSecurePhotoVerification.reverified_for_all_user_ids(self.course_id, user_ids),
+            set([self.user.id])
+        )
+
     def test_original_verification(self):
         orig_attempt = SoftwareSecurePhotoVerification(user=self.user)
         orig_attempt.save()
@@ -10,6 +10,7 @@ settings.INSTALLED_APPS  # pylint: disable=W0104
 from django_startup import autostartup
 import edxmako
 import logging
+from microsite_configuration import microsite
 
 log = logging.getLogger(__name__)
 
@@ -103,6 +104,9 @@ def enable_microsites():
 
         settings.STATICFILES_DIRS.insert(0, microsites_root)
 
+    # the configuration was changed in place above, so compile it now that it's complete
+    microsite.compile_configuration()
+
 
 def enable_third_party_auth():
     """